@@ -4,17 +4,40 @@ Flask Application Factory
 """
 
 import os
+import json
 from flask import Flask
 from flask_socketio import SocketIO
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize extensions
 db = SQLAlchemy()
 jwt = JWTManager()
 socketio = SocketIO()
 
+class OrjsonPacketCodec:
+    """Socket.IO packet codec backed by orjson, which encodes NumPy values in C"""
+    
+    OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        try:
+            return orjson.dumps(obj, option=OrjsonPacketCodec.OPTIONS).decode()
+        except TypeError:
+            # orjson rejects what it cannot encode natively (e.g. ints over 64 bits)
+            return json.dumps(obj, **kwargs)
+    
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
+
 def create_app(config_name=None):
     """Application factory pattern for Flask app creation."""
     
@@ -36,7 +59,11 @@ def create_app(config_name=None):
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*")
+    # Lesson state carries NumPy results; orjson serializes them without a Python round trip
+    socketio_options = {"cors_allowed_origins": "*"}
+    if orjson is not None:
+        socketio_options["json"] = OrjsonPacketCodec
+    socketio.init_app(app, **socketio_options)
     CORS(app)
     
     # Register blueprints
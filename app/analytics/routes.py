@@ -2,6 +2,8 @@
 Analytics routes
 """
 
+import json
+
 from flask import jsonify, request, current_app, Response, render_template
 from . import analytics_bp
 from .collector import collector, log_script_event, update_lesson_progress
@@ -71,6 +73,63 @@ def log_event():
             'error': str(e)
         }), 500
 
+@analytics_bp.route('/events/batch', methods=['POST'])
+def log_events_batch():
+    """Log several analytics events from a JSON array or an NDJSON body."""
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            events = [
+                json.loads(line)
+                for line in request.get_data(as_text=True).splitlines()
+                if line.strip()
+            ]
+        else:
+            events = request.get_json()
+        
+        if not events or not isinstance(events, list):
+            return jsonify({
+                'success': False,
+                'error': 'A list of events is required'
+            }), 400
+        
+        # Validate the whole batch before buffering any of it
+        required_fields = ['event_type', 'session_id']
+        for index, event in enumerate(events):
+            for field in required_fields:
+                if field not in event:
+                    return jsonify({
+                        'success': False,
+                        'error': f'Event {index} missing required field: {field}'
+                    }), 400
+        
+        failed = 0
+        for event in events:
+            if not collector.log_event(
+                event_type=event['event_type'],
+                session_id=event['session_id'],
+                user_id=event.get('user_id'),
+                lesson_id=event.get('lesson_id'),
+                data=event.get('data')
+            ):
+                failed += 1
+        
+        if failed == 0:
+            return jsonify({
+                'success': True,
+                'message': f'{len(events)} events logged successfully'
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'error': f'Failed to log {failed} of {len(events)} events'
+            }), 500
+            
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @analytics_bp.route('/progress', methods=['POST'])
 def update_progress():
     """Update user progress for a lesson."""
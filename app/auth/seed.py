@@ -5,56 +5,44 @@ Seed script for creating initial users and roles
 from app import db, create_app
 from app.models import User
 from datetime import datetime
+from werkzeug.security import generate_password_hash
+
+# Default accounts: (name, email, password, role). Change these passwords in production!
+DEFAULT_USERS = [
+    ('Administrator', 'admin@chandra.edu', 'admin123', 'admin'),
+    ('Content Author', 'author@chandra.edu', 'author123', 'author'),
+    ('Sample Student', 'student@chandra.edu', 'student123', 'student'),
+]
 
 def seed_users():
     """Create initial users and roles."""
     app = create_app()
     
     with app.app_context():
-        # Check if admin user already exists
-        admin_user = User.query.filter_by(email='admin@chandra.edu').first()
-        if not admin_user:
-            admin_user = User(
-                name='Administrator',
-                email='admin@chandra.edu',
-                password='admin123',  # Change this in production!
-                role='admin'
-            )
-            admin_user.created_at = datetime.utcnow()
-            db.session.add(admin_user)
-            print("✅ Created admin user: admin@chandra.edu")
-        else:
-            print("ℹ️  Admin user already exists")
+        # Look up every existing email in one query
+        emails = [email for _, email, _, _ in DEFAULT_USERS]
+        existing = set(db.session.execute(
+            db.select(User.email).where(User.email.in_(emails))
+        ).scalars())
         
-        # Create sample author
-        author_user = User.query.filter_by(email='author@chandra.edu').first()
-        if not author_user:
-            author_user = User(
-                name='Content Author',
-                email='author@chandra.edu',
-                password='author123',  # Change this in production!
-                role='author'
-            )
-            author_user.created_at = datetime.utcnow()
-            db.session.add(author_user)
-            print("✅ Created author user: author@chandra.edu")
-        else:
-            print("ℹ️  Author user already exists")
+        # Hash passwords up front, then insert all new users in a single statement
+        created_at = datetime.utcnow()
+        new_users = []
+        for name, email, password, role in DEFAULT_USERS:
+            if email in existing:
+                print(f"ℹ️  {role.capitalize()} user already exists")
+                continue
+            new_users.append({
+                'name': name,
+                'email': email,
+                'password_hash': generate_password_hash(password),
+                'role': role,
+                'created_at': created_at
+            })
+            print(f"✅ Created {role} user: {email}")
         
-        # Create sample student
-        student_user = User.query.filter_by(email='student@chandra.edu').first()
-        if not student_user:
-            student_user = User(
-                name='Sample Student',
-                email='student@chandra.edu',
-                password='student123',  # Change this in production!
-                role='student'
-            )
-            student_user.created_at = datetime.utcnow()
-            db.session.add(student_user)
-            print("✅ Created student user: student@chandra.edu")
-        else:
-            print("ℹ️  Student user already exists")
+        if new_users:
+            db.session.bulk_insert_mappings(User, new_users)
         
         try:
             db.session.commit()
@@ -5,30 +5,185 @@ A lesson that uses Python data science tools for interactive learning
 
 # Import data science libraries
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from collections import defaultdict
 import json
 
+# Numba is optional; without it the kernels below run as plain Python
+try:
+    from numba import njit, prange, get_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    
+    def get_num_threads():
+        """Stand-in for numba.get_num_threads"""
+        return 1
+
 # Lesson configuration
 LESSON_NAME = "Data Analysis with Gestures"
 DATA_POINTS = 100
 ANALYSIS_TYPES = ["descriptive", "correlation", "distribution", "trends"]
+PARALLEL_HISTOGRAM_MIN_SIZE = 10_000  # Below this np.histogram wins over thread startup
 
 # Generate sample data
-np.random.seed(42)  # For reproducible results
-data = np.random.normal(0, 1, DATA_POINTS)
-df = pd.DataFrame({
-    'values': data,
-    'squared': data ** 2,
-    'cubed': data ** 3,
-    'absolute': np.abs(data)
-})
+rng = np.random.default_rng(42)  # For reproducible results
+
+# Derived columns are computed once into one contiguous (4, n) block
+COLUMNS = ['values', 'squared', 'cubed', 'absolute']
+DATA_MATRIX = np.empty((len(COLUMNS), DATA_POINTS), dtype=np.float64, order='C')
+data = rng.standard_normal(out=DATA_MATRIX[0])
+np.square(data, out=DATA_MATRIX[1])
+np.multiply(DATA_MATRIX[1], data, out=DATA_MATRIX[2])
+np.abs(data, out=DATA_MATRIX[3])
+
+# Row views into DATA_MATRIX, no copies
+dataset = dict(zip(COLUMNS, DATA_MATRIX))
+
+# The dataset never changes, so these overview figures are fixed
+UNIQUE_VALUE_COUNT = int(np.unique(dataset['values']).size)
+MISSING_VALUES = dict(zip(COLUMNS, np.isnan(DATA_MATRIX).sum(axis=1).tolist()))
+
+# Explicit signature compiles the kernel when the lesson loads, not on the first gesture
+@njit('float64[:, ::1](float64[:, ::1])')
+def _corr_matrix(X):
+    """Pearson correlation matrix of the rows of X with one fused pass per pair"""
+    k, n = X.shape
+    means = np.empty(k)
+    for i in range(k):
+        total = 0.0
+        for t in range(n):
+            total += X[i, t]
+        means[i] = total / n
+    
+    C = np.eye(k)
+    for i in range(k):
+        for j in range(i + 1, k):
+            sxy = 0.0
+            sxx = 0.0
+            syy = 0.0
+            for t in range(n):
+                dx = X[i, t] - means[i]
+                dy = X[j, t] - means[j]
+                sxy += dx * dy
+                sxx += dx * dx
+                syy += dy * dy
+            C[i, j] = sxy / np.sqrt(sxx * syy)
+            C[j, i] = C[i, j]
+    return C
+
+@njit(parallel=True)
+def _parallel_histogram(values, lo, hi, nbins):
+    """Equal-width histogram counted in per-thread chunks, then summed"""
+    nchunks = get_num_threads()
+    partial = np.zeros((nchunks, nbins), dtype=np.int64)
+    chunk = (values.size + nchunks - 1) // nchunks
+    scale = nbins / (hi - lo)
+    for c in prange(nchunks):
+        start = c * chunk
+        stop = min(start + chunk, values.size)
+        for i in range(start, stop):
+            b = int((values[i] - lo) * scale)
+            if b >= nbins:
+                b = nbins - 1
+            partial[c, b] += 1
+    return partial.sum(axis=0)
+
+def calculate_histogram(values, nbins):
+    """Histogram counts and edges, using the parallel kernel for large inputs"""
+    if not NUMBA_AVAILABLE or values.size <= PARALLEL_HISTOGRAM_MIN_SIZE:
+        return np.histogram(values, bins=nbins)
+    
+    # Same range handling as np.histogram
+    lo, hi = float(values.min()), float(values.max())
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return _parallel_histogram(values, lo, hi, nbins), np.linspace(lo, hi, nbins + 1)
+
+def calculate_percentiles(values, percentiles):
+    """Calculate several percentiles from one partial sort (linear interpolation)"""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    positions = np.asarray(percentiles, dtype=np.float64) / 100.0 * (arr.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    
+    # Only the bracketing ranks need to be in sorted position
+    partitioned = np.partition(arr, np.unique(np.concatenate([lower, upper])))
+    weight = positions - lower
+    return partitioned[lower] * (1.0 - weight) + partitioned[upper] * weight
+
+@njit
+def _finish_moments(n, mean, m2_sum, m3_sum, m4_sum, lo, hi):
+    """Turn central moment sums into mean, sample std, min, max, skewness and excess kurtosis"""
+    m2 = m2_sum / n
+    m3 = m3_sum / n
+    m4 = m4_sum / n
+    std = np.sqrt(m2_sum / (n - 1))
+    skewness = np.sqrt(n * (n - 1)) / (n - 2) * m3 / m2 ** 1.5
+    kurtosis = (n - 1) / ((n - 2) * (n - 3)) * ((n + 1) * m4 / (m2 * m2) - 3 * (n - 1))
+    return mean, std, lo, hi, skewness, kurtosis
+
+@njit('UniTuple(float64, 6)(float64[::1])')
+def _moments(values):
+    """Single-pass (Welford/Terriberry) moments of values"""
+    mean = 0.0
+    m2_sum = 0.0
+    m3_sum = 0.0
+    m4_sum = 0.0
+    lo = values[0]
+    hi = values[0]
+    for i in range(values.size):
+        x = values[i]
+        if x < lo:
+            lo = x
+        if x > hi:
+            hi = x
+        n = i + 1
+        delta = x - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * i
+        mean += delta_n
+        m4_sum += term * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * m2_sum - 4 * delta_n * m3_sum
+        m3_sum += term * delta_n * (n - 2) - 3 * delta_n * m2_sum
+        m2_sum += term
+    return _finish_moments(values.size, mean, m2_sum, m3_sum, m4_sum, lo, hi)
+
+def calculate_moments(values):
+    """Mean, sample std, min, max, skewness and excess kurtosis (bias-corrected, as pandas)"""
+    if NUMBA_AVAILABLE:
+        return _moments(values)
+    
+    # Vectorized passes beat an interpreted single-pass loop
+    mean = values.mean()
+    deviations = values - mean
+    squared = deviations * deviations
+    moments = _finish_moments(values.size, mean, squared.sum(), (squared * deviations).sum(),
+                              (squared * squared).sum(), values.min(), values.max())
+    return tuple(float(m) for m in moments)
+
+def running_sum(values):
+    """Cumulative sum with a leading zero, so sum(values[a:b]) is cs[b] - cs[a]"""
+    cumulative = np.empty(values.size + 1, dtype=np.float64)
+    cumulative[0] = 0.0
+    np.cumsum(values, out=cumulative[1:])
+    return cumulative
+
+def rolling_mean(cumulative, window):
+    """Trailing moving average over full windows of a running_sum array"""
+    return (cumulative[window:] - cumulative[:-window]) / window
 
 # Lesson state
 analyses_performed = 0
 current_analysis = None
 analysis_results = {}
+corr_cache = None  # Correlation matrix of the fixed dataset, filled on first use
 
 @on_start
 def lesson_start():
@@ -44,14 +199,16 @@ def lesson_start():
     analysis_results = {}
     
     # Calculate basic statistics
+    values = dataset['values']
+    mean, std, minimum, maximum, skewness, kurtosis = calculate_moments(values)
     basic_stats = {
-        "mean": float(df['values'].mean()),
-        "std": float(df['values'].std()),
-        "min": float(df['values'].min()),
-        "max": float(df['values'].max()),
-        "median": float(df['values'].median()),
-        "skewness": float(df['values'].skew()),
-        "kurtosis": float(df['values'].kurtosis())
+        "mean": mean,
+        "std": std,
+        "min": minimum,
+        "max": maximum,
+        "median": float(calculate_percentiles(values, [50])[0]),
+        "skewness": skewness,
+        "kurtosis": kurtosis
     }
     
     # Update lesson state
@@ -72,11 +229,211 @@ def lesson_start():
         "basic_statistics": basic_stats
     })
 
+def _do_descriptive():
+    """Descriptive statistics analysis for the fist gesture"""
+    global analyses_performed, current_analysis, analysis_results
+    
+    current_analysis = "descriptive"
+    analyses_performed += 1
+    
+    # Calculate percentiles
+    percentiles = [25, 50, 75, 90, 95]
+    percentile_values = calculate_percentiles(dataset['values'], percentiles).tolist()
+    
+    # Quartiles come from the same partition pass
+    q1, q3 = percentile_values[0], percentile_values[2]
+    iqr = q3 - q1
+    values = dataset['values']
+    lower_fence = q1 - 1.5*iqr
+    upper_fence = q3 + 1.5*iqr
+    
+    analysis_results["descriptive"] = {
+        "percentiles": dict(zip(percentiles, percentile_values)),
+        "quartiles": {"Q1": q1, "Q3": q3, "IQR": iqr},
+        "outliers": int(np.count_nonzero((values < lower_fence) | (values > upper_fence)))
+    }
+    
+    emit("analysis_complete", {
+        "type": "descriptive",
+        "results": analysis_results["descriptive"]
+    })
+
+def _do_correlation():
+    """Correlation analysis for the open_hand gesture"""
+    global analyses_performed, current_analysis, analysis_results, corr_cache
+    
+    current_analysis = "correlation"
+    analyses_performed += 1
+    
+    # Calculate correlations between all columns once; the dataset never changes
+    if corr_cache is None:
+        # Interpreted loops are slower than corrcoef, so only use the kernel when compiled
+        corr_cache = _corr_matrix(DATA_MATRIX) if NUMBA_AVAILABLE else np.corrcoef(DATA_MATRIX)
+    corr_matrix = corr_cache
+    correlations = {
+        f"{col1}_vs_{col2}": float(corr_matrix[i, j])
+        for i, col1 in enumerate(COLUMNS)
+        for j, col2 in enumerate(COLUMNS)
+        if i != j
+    }
+    
+    # Find strongest correlations among the distinct pairs (upper triangle)
+    rows, cols = np.triu_indices_from(corr_matrix, k=1)
+    pair_corrs = corr_matrix[rows, cols]
+    strength = np.abs(pair_corrs)
+    top = np.argpartition(strength, -3)[-3:]
+    top = top[np.argsort(-strength[top])]
+    strongest_correlations = [
+        (f"{COLUMNS[rows[k]]}_vs_{COLUMNS[cols[k]]}", float(pair_corrs[k]))
+        for k in top
+    ]
+    
+    analysis_results["correlation"] = {
+        "all_correlations": correlations,
+        "strongest_correlations": strongest_correlations,
+        "mean_correlation": float(pair_corrs.mean())
+    }
+    
+    emit("analysis_complete", {
+        "type": "correlation",
+        "results": analysis_results["correlation"]
+    })
+
+def _do_distribution():
+    """Distribution analysis for the point gesture"""
+    global analyses_performed, current_analysis, analysis_results
+    
+    current_analysis = "distribution"
+    analyses_performed += 1
+    
+    # Generate histogram data
+    hist, bins = calculate_histogram(dataset['values'], 10)
+    bin_centers = (bins[:-1] + bins[1:]) / 2
+    
+    # Calculate distribution statistics
+    skewness, kurtosis = calculate_moments(dataset['values'])[4:]
+    
+    # Check for normality (simplified)
+    is_normal = abs(skewness) < 0.5 and abs(kurtosis) < 1.0
+    
+    analysis_results["distribution"] = {
+        "histogram": {
+            "counts": hist.tolist(),
+            "bin_centers": bin_centers.tolist(),
+            "bins": bins.tolist()
+        },
+        "skewness": skewness,
+        "kurtosis": kurtosis,
+        "is_normal_like": is_normal,
+        "unique_values": UNIQUE_VALUE_COUNT
+    }
+    
+    emit("analysis_complete", {
+        "type": "distribution",
+        "results": analysis_results["distribution"]
+    })
+
+def _do_trends():
+    """Trend analysis for the victory gesture"""
+    global analyses_performed, current_analysis, analysis_results
+    
+    current_analysis = "trends"
+    analyses_performed += 1
+    
+    # Calculate moving averages
+    window_sizes = [5, 10, 20]
+    moving_averages = {}
+    
+    values = dataset['values']
+    cumulative = running_sum(values)
+    
+    for window in window_sizes:
+        if values.size >= window:
+            moving_averages[f"ma_{window}"] = rolling_mean(cumulative, window).tolist()
+    
+    # Calculate trend direction from the same running sum
+    quarter = values.size // 4
+    first_quarter = cumulative[quarter] / quarter
+    last_quarter = (cumulative[-1] - cumulative[-quarter - 1]) / quarter
+    trend_direction = "increasing" if last_quarter > first_quarter else "decreasing"
+    trend_strength = abs(last_quarter - first_quarter)
+    
+    analysis_results["trends"] = {
+        "moving_averages": moving_averages,
+        "trend_direction": trend_direction,
+        "trend_strength": float(trend_strength),
+        "first_quarter_mean": float(first_quarter),
+        "last_quarter_mean": float(last_quarter)
+    }
+    
+    emit("analysis_complete", {
+        "type": "trends",
+        "results": analysis_results["trends"]
+    })
+
+def _do_summary():
+    """Summary analysis for the thumbs_up gesture"""
+    global analyses_performed, current_analysis, analysis_results
+    
+    current_analysis = "summary"
+    analyses_performed += 1
+    
+    # Create comprehensive summary
+    summary = {
+        "data_overview": {
+            "total_points": DATA_POINTS,
+            "columns": list(COLUMNS),
+            "memory_usage": int(DATA_MATRIX.nbytes),
+            "missing_values": dict(MISSING_VALUES)
+        },
+        "statistical_summary": {
+            "descriptive": analysis_results.get("descriptive", {}),
+            "correlation": analysis_results.get("correlation", {}),
+            "distribution": analysis_results.get("distribution", {}),
+            "trends": analysis_results.get("trends", {})
+        },
+        "insights": []
+    }
+    
+    # Generate insights
+    if "descriptive" in analysis_results:
+        desc = analysis_results["descriptive"]
+        if desc.get("outliers", 0) > 0:
+            summary["insights"].append(f"Found {desc['outliers']} outliers in the data")
+    
+    if "correlation" in analysis_results:
+        corr = analysis_results["correlation"]
+        strongest = corr.get("strongest_correlations", [])
+        if strongest:
+            strongest_pair = strongest[0]
+            summary["insights"].append(f"Strongest correlation: {strongest_pair[0]} ({strongest_pair[1]:.3f})")
+    
+    if "distribution" in analysis_results:
+        dist = analysis_results["distribution"]
+        if dist.get("is_normal_like"):
+            summary["insights"].append("Data appears to follow a normal distribution")
+        else:
+            summary["insights"].append("Data shows non-normal distribution characteristics")
+    
+    analysis_results["summary"] = summary
+    
+    emit("analysis_complete", {
+        "type": "summary",
+        "results": analysis_results["summary"]
+    })
+
+# Gesture -> analysis handler, built once at load
+ANALYSIS_DISPATCH = {
+    "fist": _do_descriptive,
+    "open_hand": _do_correlation,
+    "point": _do_distribution,
+    "victory": _do_trends,
+    "thumbs_up": _do_summary,
+}
+
 @on_gesture
 def handle_gesture(gesture_data):
     """Called when a gesture is detected"""
-    global analyses_performed, current_analysis, analysis_results
-    
     gesture = gesture_data.get("gesture")
     
     if not gesture:
@@ -85,210 +442,18 @@ def handle_gesture(gesture_data):
     log("INFO", f"Processing gesture: {gesture}")
     
     # Different gestures trigger different analyses
-    if gesture == "fist":
-        # Descriptive statistics analysis
-        current_analysis = "descriptive"
-        analyses_performed += 1
-        
-        # Calculate percentiles
-        percentiles = [25, 50, 75, 90, 95]
-        percentile_values = [float(df['values'].quantile(p/100)) for p in percentiles]
-        
-        # Calculate quartiles and IQR
-        q1, q3 = float(df['values'].quantile(0.25)), float(df['values'].quantile(0.75))
-        iqr = q3 - q1
-        
-        analysis_results["descriptive"] = {
-            "percentiles": dict(zip(percentiles, percentile_values)),
-            "quartiles": {"Q1": q1, "Q3": q3, "IQR": iqr},
-            "outliers": len(df[df['values'] > q3 + 1.5*iqr]) + len(df[df['values'] < q1 - 1.5*iqr])
-        }
-        
-        state.update({
-            "analyses_performed": analyses_performed,
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results
-        })
-        
-        emit("analysis_complete", {
-            "type": "descriptive",
-            "results": analysis_results["descriptive"]
-        })
-    
-    elif gesture == "open_hand":
-        # Correlation analysis
-        current_analysis = "correlation"
-        analyses_performed += 1
-        
-        # Calculate correlations between all columns
-        corr_matrix = df.corr()
-        correlations = {}
-        
-        for col1 in df.columns:
-            for col2 in df.columns:
-                if col1 != col2:
-                    correlations[f"{col1}_vs_{col2}"] = float(corr_matrix.loc[col1, col2])
-        
-        # Find strongest correlations
-        corr_pairs = [(k, v) for k, v in correlations.items()]
-        corr_pairs.sort(key=lambda x: abs(x[1]), reverse=True)
-        strongest_correlations = corr_pairs[:3]
-        
-        analysis_results["correlation"] = {
-            "all_correlations": correlations,
-            "strongest_correlations": strongest_correlations,
-            "mean_correlation": float(corr_matrix.values[np.triu_indices_from(corr_matrix.values, k=1)].mean())
-        }
-        
-        state.update({
-            "analyses_performed": analyses_performed,
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results
-        })
-        
-        emit("analysis_complete", {
-            "type": "correlation",
-            "results": analysis_results["correlation"]
-        })
-    
-    elif gesture == "point":
-        # Distribution analysis
-        current_analysis = "distribution"
-        analyses_performed += 1
-        
-        # Generate histogram data
-        hist, bins = np.histogram(df['values'], bins=10)
-        bin_centers = (bins[:-1] + bins[1:]) / 2
-        
-        # Calculate distribution statistics
-        skewness = float(df['values'].skew())
-        kurtosis = float(df['values'].kurtosis())
-        
-        # Check for normality (simplified)
-        is_normal = abs(skewness) < 0.5 and abs(kurtosis) < 1.0
-        
-        analysis_results["distribution"] = {
-            "histogram": {
-                "counts": hist.tolist(),
-                "bin_centers": bin_centers.tolist(),
-                "bins": bins.tolist()
-            },
-            "skewness": skewness,
-            "kurtosis": kurtosis,
-            "is_normal_like": is_normal,
-            "unique_values": int(df['values'].nunique())
-        }
-        
-        state.update({
-            "analyses_performed": analyses_performed,
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results
-        })
-        
-        emit("analysis_complete", {
-            "type": "distribution",
-            "results": analysis_results["distribution"]
-        })
-    
-    elif gesture == "victory":
-        # Trend analysis
-        current_analysis = "trends"
-        analyses_performed += 1
-        
-        # Calculate moving averages
-        window_sizes = [5, 10, 20]
-        moving_averages = {}
-        
-        for window in window_sizes:
-            if len(df) >= window:
-                ma = df['values'].rolling(window=window).mean()
-                moving_averages[f"ma_{window}"] = ma.dropna().tolist()
-        
-        # Calculate trend direction
-        first_quarter = df['values'].iloc[:len(df)//4].mean()
-        last_quarter = df['values'].iloc[-len(df)//4:].mean()
-        trend_direction = "increasing" if last_quarter > first_quarter else "decreasing"
-        trend_strength = abs(last_quarter - first_quarter)
-        
-        analysis_results["trends"] = {
-            "moving_averages": moving_averages,
-            "trend_direction": trend_direction,
-            "trend_strength": float(trend_strength),
-            "first_quarter_mean": float(first_quarter),
-            "last_quarter_mean": float(last_quarter)
-        }
-        
-        state.update({
-            "analyses_performed": analyses_performed,
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results
-        })
-        
-        emit("analysis_complete", {
-            "type": "trends",
-            "results": analysis_results["trends"]
-        })
-    
-    elif gesture == "thumbs_up":
-        # Summary analysis
-        current_analysis = "summary"
-        analyses_performed += 1
-        
-        # Create comprehensive summary
-        summary = {
-            "data_overview": {
-                "total_points": len(df),
-                "columns": list(df.columns),
-                "memory_usage": df.memory_usage(deep=True).sum(),
-                "missing_values": df.isnull().sum().to_dict()
-            },
-            "statistical_summary": {
-                "descriptive": analysis_results.get("descriptive", {}),
-                "correlation": analysis_results.get("correlation", {}),
-                "distribution": analysis_results.get("distribution", {}),
-                "trends": analysis_results.get("trends", {})
-            },
-            "insights": []
-        }
-        
-        # Generate insights
-        if "descriptive" in analysis_results:
-            desc = analysis_results["descriptive"]
-            if desc.get("outliers", 0) > 0:
-                summary["insights"].append(f"Found {desc['outliers']} outliers in the data")
-        
-        if "correlation" in analysis_results:
-            corr = analysis_results["correlation"]
-            strongest = corr.get("strongest_correlations", [])
-            if strongest:
-                strongest_pair = strongest[0]
-                summary["insights"].append(f"Strongest correlation: {strongest_pair[0]} ({strongest_pair[1]:.3f})")
-        
-        if "distribution" in analysis_results:
-            dist = analysis_results["distribution"]
-            if dist.get("is_normal_like"):
-                summary["insights"].append("Data appears to follow a normal distribution")
-            else:
-                summary["insights"].append("Data shows non-normal distribution characteristics")
-        
-        analysis_results["summary"] = summary
-        
-        state.update({
-            "analyses_performed": analyses_performed,
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results
-        })
-        
-        emit("analysis_complete", {
-            "type": "summary",
-            "results": analysis_results["summary"]
-        })
+    handler = ANALYSIS_DISPATCH.get(gesture)
+    if handler:
+        handler()
     
     # Update progress
     progress = min(100.0, analyses_performed * 25.0)  # 4 analyses = 100%
     
-    # Update state
+    # One state write per gesture
     state.update({
+        "analyses_performed": analyses_performed,
+        "current_analysis": current_analysis,
+        "analysis_results": analysis_results,
         "current_gesture": gesture,
         "lesson_progress": progress
     })
@@ -313,27 +478,33 @@ def handle_gesture(gesture_data):
 @on_tick
 def lesson_tick():
     """Called periodically during the lesson"""
+    snapshot = state.snapshot()
+    start_time = snapshot.get("start_time")
+    analyses_performed = snapshot.get("analyses_performed", 0)
+    duration = snapshot.get("lesson_duration", 0)
+    analysis_rate = snapshot.get("analysis_rate", 0)
+    updates = {}
+    
     # Update lesson duration
-    start_time = state.get("start_time")
     if start_time:
         duration = time.time() - start_time
-        state.set("lesson_duration", duration)
+        updates["lesson_duration"] = duration
     
     # Calculate analysis efficiency
-    analyses_performed = state.get("analyses_performed", 0)
-    duration = state.get("lesson_duration", 0)
-    
     if duration > 0:
         analysis_rate = analyses_performed / duration
-        state.set("analysis_rate", analysis_rate)
+        updates["analysis_rate"] = analysis_rate
+    
+    if updates:
+        state.update(updates)
     
     # Emit periodic update
     emit("lesson_tick", {
         "analyses_performed": analyses_performed,
-        "progress": state.get("lesson_progress", 0),
-        "current_analysis": state.get("current_analysis"),
+        "progress": snapshot.get("lesson_progress", 0),
+        "current_analysis": snapshot.get("current_analysis"),
         "lesson_duration": duration,
-        "analysis_rate": state.get("analysis_rate", 0)
+        "analysis_rate": analysis_rate
     })
 
 @on_complete
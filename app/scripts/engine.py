@@ -5,18 +5,24 @@ Provides a more flexible and powerful execution environment for interactive less
 
 import os
 import sys
+import builtins
 import time
 import json
 import logging
 import importlib
 import traceback
 from datetime import datetime
-from typing import Dict, Any, Optional, Callable, List
+from types import CodeType, MappingProxyType
+from typing import Dict, Any, Optional, Callable, List, Deque, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from contextlib import contextmanager
 import threading
 import queue
+from collections import deque
+
+# The import machinery as it was before any lesson hook was installed
+_REAL_IMPORT = builtins.__import__
 
 # Safe imports for lesson scripts
 SAFE_MODULES = {
@@ -71,9 +77,10 @@ class LessonState:
         self.lesson_id = lesson_id
         self.session_id = session_id
         self._state = {}
-        self._history = []
+        self._history = deque(maxlen=100)  # Keep last 100 changes
         self._start_time = None
         self._event_callbacks = []
+        self._subscribers = []
     
     def set(self, key: str, value: Any):
         """Set a state value"""
@@ -83,15 +90,37 @@ class LessonState:
             'key': key,
             'value': value
         })
+        self._notify(key, value)
     
     def get(self, key: str, default=None):
         """Get a state value"""
         return self._state.get(key, default)
     
     def update(self, updates: Dict[str, Any]):
-        """Update multiple state values"""
-        for key, value in updates.items():
-            self.set(key, value)
+        """Update multiple state values in a single merge"""
+        self._state.update(updates)
+        
+        timestamp = time.time()
+        self._history.extend(
+            {'timestamp': timestamp, 'key': key, 'value': value}
+            for key, value in updates.items()
+        )
+        
+        if self._subscribers:
+            for key, value in updates.items():
+                self._notify(key, value)
+    
+    def _notify(self, key: str, value: Any):
+        """Pass a changed value to every subscriber"""
+        for callback in self._subscribers:
+            try:
+                callback(key, value)
+            except Exception as e:
+                logging.error(f"State subscriber failed for {self.lesson_id}: {e}")
+    
+    def snapshot(self):
+        """Get a read-only view of all current state values"""
+        return MappingProxyType(self._state)
     
     def clear(self):
         """Clear all state"""
@@ -102,7 +131,7 @@ class LessonState:
         """Convert state to dictionary"""
         return {
             'state': self._state.copy(),
-            'history': self._history[-100:],  # Keep last 100 changes
+            'history': list(self._history),
             'start_time': self._start_time,
             'duration': time.time() - self._start_time if self._start_time else 0
         }
@@ -115,6 +144,10 @@ class LessonState:
     def add_event_callback(self, callback: Callable[[LessonEvent], None]):
         """Add an event callback"""
         self._event_callbacks.append(callback)
+    
+    def subscribe(self, callback: Callable[[str, Any], None]):
+        """Call callback(key, value) whenever a state value is set"""
+        self._subscribers.append(callback)
 
 class LessonAPI:
     """Provides a clean API for lesson scripts"""
@@ -127,19 +160,24 @@ class LessonAPI:
         self._running = False
         self._hooks = {}
     
-    def log(self, level: str, message: str, **kwargs):
-        """Log a message with optional data"""
+    def log(self, level: str, message: str, *args, **kwargs):
+        """Log a message with optional %-style args and data"""
+        levelno = getattr(logging, level.upper(), logging.INFO)
+        
+        # Clients get the formatted text; the stdlib logger formats lazily
         event = LessonEvent(
             timestamp=time.time(),
             event_type='log',
-            data={'message': message, 'level': level, **kwargs},
+            data={'message': message % args if args else message, 'level': level, **kwargs},
             lesson_id=self.lesson_id,
             session_id=self.session_id,
             severity=level
         )
         self._events.put(event)
-        logging.log(getattr(logging, level.upper(), logging.INFO), 
-                   f"[{self.lesson_id}] {message}")
+        if args:
+            logging.log(levelno, "[%s] " + message, self.lesson_id, *args)
+        else:
+            logging.log(levelno, "[%s] %s", self.lesson_id, message)
     
     def emit(self, event_type: str, data: Dict[str, Any] = None):
         """Emit a custom event"""
@@ -297,13 +335,26 @@ class LessonEnvironment:
         else:
             raise ImportError(f"Module '{module_name}' is not allowed")
     
-    def _handle_import(self, name, globals_dict, locals_dict, fromlist, level):
+    def _handle_import(self, name, globals_dict=None, locals_dict=None, fromlist=(), level=0):
         """Custom import handler for safe modules"""
+        # Imports made by an allowed package itself (numpy loading numpy.random or
+        # numpy.ma on first use, and whatever those need) are not the lesson's to
+        # vet; extension modules import through importlib's own frames
+        importer = (globals_dict or {}).get('__name__') or ''
+        from_package = (globals_dict is not self.module.__dict__ and
+                        importer.split('.')[0] in (*SAFE_MODULES, 'importlib'))
+        if level > 0 or from_package:
+            return _REAL_IMPORT(name, globals_dict, locals_dict, fromlist, level)
+        
         # Check if this is a submodule of an allowed module
         base_module = name.split('.')[0]
         
         if name in SAFE_MODULES or base_module in SAFE_MODULES:
-            return self._safe_import(name)
+            if self._safe_import(name) is None:
+                return None
+            # Now loaded; let the real import return the package or submodule
+            # the statement expects (`import numpy.random` binds numpy)
+            return _REAL_IMPORT(name, globals_dict, locals_dict, fromlist, level)
         else:
             # Allow standard library imports that are commonly needed
             # Include modules that numpy and other scientific libraries need internally
@@ -322,8 +373,8 @@ class LessonEnvironment:
             else:
                 raise ImportError(f"Import of '{name}' is not allowed")
     
-    def load_lesson(self, lesson_code: str) -> bool:
-        """Load and compile a lesson"""
+    def load_lesson(self, lesson_code: Union[str, CodeType]) -> bool:
+        """Load and compile a lesson (source or a precompiled code object)"""
         try:
             # Create a custom module
             self.module = type(sys.modules[__name__])(f"lesson_{self.lesson_id}")
@@ -442,11 +493,11 @@ class LessonOrchestrator:
     def __init__(self):
         self.active_lessons: Dict[str, LessonEnvironment] = {}
         self.lesson_metadata: Dict[str, LessonMetadata] = {}
-        self.event_log: List[LessonEvent] = []
+        self.event_log: Deque[LessonEvent] = deque(maxlen=1000)  # Keep last 1000 events
         self.tick_interval = 1.0  # seconds
         self.last_tick = 0
         
-    def load_lesson(self, lesson_id: str, lesson_code: str, metadata: LessonMetadata) -> bool:
+    def load_lesson(self, lesson_id: str, lesson_code: Union[str, CodeType], metadata: LessonMetadata) -> bool:
         """Load a lesson into the orchestrator"""
         try:
             # Create lesson environment
@@ -516,13 +567,7 @@ class LessonOrchestrator:
             environment.handle_gesture(gesture_data)
             
             # Collect events
-            events = environment.api.get_events()
-            for event in events:
-                self.event_log.append(event)
-                
-                # Keep only last 1000 events
-                if len(self.event_log) > 1000:
-                    self.event_log = self.event_log[-1000:]
+            self.event_log.extend(environment.api.get_events())
             
         except Exception as e:
             logging.error(f"Failed to handle gesture for lesson {lesson_id}: {e}")
@@ -540,9 +585,7 @@ class LessonOrchestrator:
                 environment.tick()
                 
                 # Collect events
-                events = environment.api.get_events()
-                for event in events:
-                    self.event_log.append(event)
+                self.event_log.extend(environment.api.get_events())
                 
                 # Check if lesson should be stopped
                 if environment.should_stop():
@@ -568,6 +611,15 @@ class LessonOrchestrator:
         environment = self.active_lessons[session_id]
         return environment.api.state.to_dict()
     
+    def subscribe(self, lesson_id: str, callback: Callable[[str, Any], None]) -> bool:
+        """Subscribe to state changes for a lesson"""
+        session_id = self._find_session_id(lesson_id)
+        if not session_id:
+            return False
+        
+        self.active_lessons[session_id].api.state.subscribe(callback)
+        return True
+    
     def get_recent_events(self, lesson_id: str = None, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent events for a lesson or all lessons"""
         if lesson_id:
@@ -7,9 +7,11 @@ import os
 import json
 import time
 import logging
+import threading
 import importlib.util
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Tuple, Any
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from .engine import LessonMetadata, LessonOrchestrator
@@ -51,6 +53,8 @@ class LessonManager:
         self.lesson_metadata: Dict[str, LessonMetadata] = {}
         self.file_observer = None
         self.last_reload = {}
+        self._code_cache: Dict[str, Tuple[int, CodeType]] = {}
+        self._content_cache: Dict[str, Tuple[int, str]] = {}
         
         # Ensure lessons directory exists
         self.lessons_dir.mkdir(exist_ok=True)
@@ -91,9 +95,12 @@ class LessonManager:
             return False
         
         try:
-            # Read lesson code
-            with open(lesson_file, 'r', encoding='utf-8') as f:
-                lesson_code = f.read()
+            # Reuse the compiled code if the file is unchanged since validation
+            lesson_code = self._get_cached_code(lesson_id)
+            if lesson_code is None:
+                mtime = lesson_file.stat().st_mtime_ns
+                with open(lesson_file, 'r', encoding='utf-8') as f:
+                    lesson_code = self.compile_lesson(lesson_id, f.read(), mtime)
             
             # Read or create metadata
             metadata = self._load_or_create_metadata(lesson_id, metadata_file)
@@ -116,6 +123,25 @@ class LessonManager:
             logging.error(f"Error loading lesson {lesson_id}: {e}")
             return False
     
+    def compile_lesson(self, lesson_id: str, content: str, mtime: int) -> CodeType:
+        """Compile lesson source and cache it against the file mtime it was read at"""
+        code = compile(content, f'<lesson_{lesson_id}>', 'exec')
+        self._code_cache[lesson_id] = (mtime, code)
+        return code
+    
+    def _get_cached_code(self, lesson_id: str) -> Optional[CodeType]:
+        """Get the cached code object if the lesson file has not changed"""
+        cached = self._code_cache.get(lesson_id)
+        if not cached:
+            return None
+        
+        try:
+            mtime = (self.lessons_dir / f"{lesson_id}.py").stat().st_mtime_ns
+        except OSError:
+            return None
+        
+        return cached[1] if cached[0] == mtime else None
+    
     def _load_or_create_metadata(self, lesson_id: str, metadata_file: Path) -> LessonMetadata:
         """Load existing metadata or create new metadata"""
         if metadata_file.exists():
@@ -181,6 +207,8 @@ class LessonManager:
         # Remove from tracking
         self.lesson_files.pop(lesson_id, None)
         self.lesson_metadata.pop(lesson_id, None)
+        self._code_cache.pop(lesson_id, None)
+        self._content_cache.pop(lesson_id, None)
         
         logging.info(f"Unloaded lesson: {lesson_id}")
     
@@ -227,7 +255,8 @@ A simple lesson that counts fingers and tracks progress
 # Lesson configuration
 LESSON_NAME = "{lesson_id.replace('_', ' ').title()}"
 TARGET_GESTURES = ["fist", "open_hand", "point", "victory", "thumbs_up"]
-PROGRESS_PER_GESTURE = 20.0  # 20% per gesture
+_TARGET_SET = frozenset(TARGET_GESTURES)  # O(1) membership for handle_gesture
+PROGRESS_PER_GESTURE = 100.0 / len(TARGET_GESTURES)  # Equal share per gesture
 
 # Lesson state
 total_fingers = 0
@@ -278,14 +307,20 @@ def handle_gesture(gesture_data):
     total_fingers += finger_count
     
     # Track unique gestures
-    if gesture in TARGET_GESTURES and gesture not in gestures_seen:
+    if gesture in _TARGET_SET and gesture not in gestures_seen:
         gestures_seen.add(gesture)
-        lesson_progress = min(100.0, len(gestures_seen) * PROGRESS_PER_GESTURE)
+        lesson_progress = len(gestures_seen) * PROGRESS_PER_GESTURE
         
         log("INFO", f"New gesture! Progress: {{lesson_progress:.1f}}%")
         
+        # Seen gestures and progress only change on a new target gesture
+        state.update({{
+            "gestures_seen": list(gestures_seen),
+            "lesson_progress": lesson_progress
+        }})
+        
         # Check if lesson is complete
-        if lesson_progress >= 100.0:
+        if len(gestures_seen) == len(TARGET_GESTURES):
             log("INFO", "Lesson completed!")
             emit("lesson_completed", {{
                 "total_fingers": total_fingers,
@@ -293,11 +328,9 @@ def handle_gesture(gesture_data):
                 "final_progress": lesson_progress
             }})
     
-    # Update state
+    # Update per-gesture state
     state.update({{
         "total_fingers": total_fingers,
-        "gestures_seen": list(gestures_seen),
-        "lesson_progress": lesson_progress,
         "current_gesture": gesture,
         "current_finger_count": finger_count
     }})
@@ -313,17 +346,19 @@ def handle_gesture(gesture_data):
 @on_tick
 def lesson_tick():
     """Called periodically during the lesson"""
+    snapshot = state.snapshot()
+    
     # Update lesson duration
-    start_time = state.get("_started")
+    start_time = snapshot.get("_started")
     if start_time:
         duration = time.time() - start_time
         state.set("lesson_duration", duration)
     
     # Emit periodic update
     emit("lesson_tick", {{
-        "total_fingers": state.get("total_fingers"),
-        "progress": state.get("lesson_progress"),
-        "gestures_seen": state.get("gestures_seen")
+        "total_fingers": snapshot.get("total_fingers"),
+        "progress": snapshot.get("lesson_progress"),
+        "gestures_seen": snapshot.get("gestures_seen")
     }})
 '''
         
@@ -554,12 +589,26 @@ def lesson_tick():
     
     def get_lesson_content(self, lesson_id: str) -> Optional[str]:
         """Get the content of a lesson"""
+        source = self.get_lesson_source(lesson_id)
+        return source[1] if source else None
+    
+    def get_lesson_source(self, lesson_id: str) -> Optional[Tuple[int, str]]:
+        """Get (mtime, content) of a lesson, re-reading only when the file changes"""
         if lesson_id not in self.lesson_files:
             return None
         
+        lesson_file = self.lesson_files[lesson_id]
         try:
-            with open(self.lesson_files[lesson_id], 'r', encoding='utf-8') as f:
-                return f.read()
+            mtime = lesson_file.stat().st_mtime_ns
+            cached = self._content_cache.get(lesson_id)
+            if cached and cached[0] == mtime:
+                return cached
+            
+            with open(lesson_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            self._content_cache[lesson_id] = (mtime, content)
+            return mtime, content
         except Exception as e:
             logging.error(f"Error reading lesson {lesson_id}: {e}")
             return None
@@ -569,6 +618,8 @@ def lesson_tick():
         if lesson_id not in self.lesson_files:
             return False
         
+        self._content_cache.pop(lesson_id, None)
+        
         try:
             with open(self.lesson_files[lesson_id], 'w', encoding='utf-8') as f:
                 f.write(content)
@@ -600,6 +651,20 @@ def lesson_tick():
         """Handle periodic tick for all lessons"""
         self.orchestrator.tick()
     
+    def subscribe(self, lesson_id: str, callback: Callable[[str, Any], None]) -> bool:
+        """Call callback(key, value) whenever the lesson's state changes"""
+        return self.orchestrator.subscribe(lesson_id, callback)
+    
+    def start_ticker(self, stop_event: threading.Event) -> threading.Thread:
+        """Tick all lessons from a background thread until stop_event is set"""
+        def run():
+            while not stop_event.wait(self.orchestrator.tick_interval):
+                self.tick()
+        
+        thread = threading.Thread(target=run, name="lesson-ticker", daemon=True)
+        thread.start()
+        return thread
+    
     def shutdown(self):
         """Shutdown the lesson manager"""
         if self.file_observer:
@@ -265,17 +265,18 @@ def validate_lesson(lesson_id):
     try:
         manager = get_lesson_manager()
         
-        # Get lesson content
-        content = manager.get_lesson_content(lesson_id)
-        if not content:
+        # Get lesson content, with the mtime it was read at
+        source = manager.get_lesson_source(lesson_id)
+        if not source or not source[1]:
             return jsonify({
                 'success': False,
                 'error': f'Lesson {lesson_id} not found'
             }), 404
+        mtime, content = source
         
         # Basic syntax validation
         try:
-            compile(content, f'<lesson_{lesson_id}>', 'exec')
+            manager.compile_lesson(lesson_id, content, mtime)
             syntax_valid = True
             syntax_errors = []
         except SyntaxError as e:
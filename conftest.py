@@ -0,0 +1,22 @@
+"""
+Shared pytest setup for the test scripts
+"""
+
+import pytest
+
+from testutils import server_up as _server_up
+
+# Drives ScriptSandbox and scripts/letter_tracing.py, neither of which exists in
+# this tree; it is kept as a standalone script until the lesson is ported
+collect_ignore = ["test_letter_tracing.py"]
+
+@pytest.fixture(scope="session")
+def server_up():
+    """Probe the dev server once per pytest run"""
+    return _server_up()
+
+@pytest.fixture
+def dev_server(server_up):
+    """Skip a test that talks to the dev server when it is not running"""
+    if not server_up:
+        pytest.skip("Dev server not reachable at localhost:5000")
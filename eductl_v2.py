@@ -6,26 +6,45 @@ Command-line interface for managing lessons and leveraging Python tools
 
 import os
 import sys
+import ast
 import argparse
 import json
-import time
+import threading
 import subprocess
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict, Any
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import create_app
 from app.scripts.manager import LessonManager
 
-def create_lesson(args):
-    """Create a new lesson"""
+@contextmanager
+def _get_manager(require_app=False):
+    """Yield a LessonManager, creating the Flask app only when required"""
+    if not require_app:
+        yield LessonManager()
+        return
+    
+    # Deferred so read-only commands never pay for app creation
+    from app import create_app
     app = create_app()
     
     with app.app_context():
-        manager = LessonManager()
-        
+        yield LessonManager()
+
+def _get_content_or_exit(manager, lesson_id):
+    """Get lesson content, exiting with an error if the lesson is missing"""
+    content = manager.get_lesson_content(lesson_id)
+    if not content:
+        print(f"❌ Lesson '{lesson_id}' not found")
+        sys.exit(1)
+    return content
+
+def create_lesson(args):
+    """Create a new lesson"""
+    with _get_manager(require_app=True) as manager:
         lesson_id = args.name
         template = args.template
         
@@ -51,10 +70,7 @@ def create_lesson(args):
 
 def list_lessons(args):
     """List all available lessons"""
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
+    with _get_manager() as manager:
         lessons = manager.get_lesson_list()
         
         if not lessons:
@@ -65,27 +81,27 @@ def list_lessons(args):
         print()
         
         for lesson in lessons:
-            print(f"📝 {lesson['name']} ({lesson['id']})")
-            print(f"   Description: {lesson['description']}")
-            print(f"   Author: {lesson['author']}")
-            print(f"   Version: {lesson['version']}")
-            print(f"   Created: {lesson['created']}")
-            print(f"   Tags: {', '.join(lesson['tags'])}")
-            print(f"   Difficulty: {lesson['difficulty']}")
-            print(f"   Duration: {lesson['duration']} minutes")
+            # Build each record and write it in one call
+            parts = [
+                f"📝 {lesson['name']} ({lesson['id']})",
+                f"   Description: {lesson['description']}",
+                f"   Author: {lesson['author']}",
+                f"   Version: {lesson['version']}",
+                f"   Created: {lesson['created']}",
+                f"   Tags: {', '.join(lesson['tags'])}",
+                f"   Difficulty: {lesson['difficulty']}",
+                f"   Duration: {lesson['duration']} minutes",
+            ]
             
             if lesson['requirements']:
-                print(f"   Requirements: {', '.join(lesson['requirements'])}")
+                parts.append(f"   Requirements: {', '.join(lesson['requirements'])}")
             
-            print()
+            parts.append("")
+            print('\n'.join(parts))
 
 def run_lesson(args):
     """Run a lesson"""
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
-        
+    with _get_manager(require_app=True) as manager:
         lesson_id = args.name
         
         print(f"Starting lesson '{lesson_id}'...")
@@ -97,6 +113,13 @@ def run_lesson(args):
                 print(f"❌ Failed to load lesson '{lesson_id}'")
                 sys.exit(1)
         
+        # Show progress as soon as the lesson reports it
+        def show_progress(key, value):
+            if key == 'lesson_progress' and value:
+                print(f"\r📊 Progress: {value:.1f}%", end='', flush=True)
+        
+        manager.subscribe(lesson_id, show_progress)
+        
         # Start the lesson
         success = manager.start_lesson(lesson_id)
         
@@ -104,19 +127,14 @@ def run_lesson(args):
             print(f"✅ Lesson '{lesson_id}' started successfully!")
             print("Press Ctrl+C to stop the lesson...")
             
+            stop_event = threading.Event()
+            manager.start_ticker(stop_event)
+            
             try:
-                # Keep the lesson running
-                while True:
-                    time.sleep(1)
-                    manager.tick()
-                    
-                    # Show state updates
-                    state = manager.get_lesson_state(lesson_id)
-                    if state and state.get('state', {}).get('lesson_progress'):
-                        progress = state['state']['lesson_progress']
-                        print(f"\r📊 Progress: {progress:.1f}%", end='', flush=True)
-                        
+                # Keep the lesson running; ticks happen on the manager's thread
+                stop_event.wait()
             except KeyboardInterrupt:
+                stop_event.set()
                 print("\n🛑 Stopping lesson...")
                 manager.stop_lesson(lesson_id)
                 print("✅ Lesson stopped.")
@@ -126,20 +144,12 @@ def run_lesson(args):
 
 def validate_lesson(args):
     """Validate a lesson"""
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
-        
+    with _get_manager() as manager:
         lesson_id = args.name
         
         print(f"Validating lesson '{lesson_id}'...")
         
-        # Get lesson content
-        content = manager.get_lesson_content(lesson_id)
-        if not content:
-            print(f"❌ Lesson '{lesson_id}' not found")
-            sys.exit(1)
+        content = _get_content_or_exit(manager, lesson_id)
         
         # Basic syntax validation
         try:
@@ -184,36 +194,31 @@ def export_lessons(args):
     import zipfile
     from datetime import datetime
     
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
-        
+    with _get_manager() as manager:
         # Create zip file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         zip_filename = f"chandra_lessons_{timestamp}.zip"
         
         print(f"Exporting lessons to '{zip_filename}'...")
         
+        # One directory listing instead of a stat() per lesson
+        metadata_names = {p.name for p in manager.lessons_dir.glob('*.json')}
+        
         with zipfile.ZipFile(zip_filename, 'w') as zipf:
             # Add all lesson files
             for lesson_id, lesson_file in manager.lesson_files.items():
                 zipf.write(lesson_file, f"lessons/{lesson_file.name}")
                 
                 # Add metadata file if it exists
-                metadata_file = manager.lessons_dir / f"{lesson_id}.json"
-                if metadata_file.exists():
-                    zipf.write(metadata_file, f"lessons/{metadata_file.name}")
+                metadata_name = f"{lesson_id}.json"
+                if metadata_name in metadata_names:
+                    zipf.write(manager.lessons_dir / metadata_name, f"lessons/{metadata_name}")
         
         print(f"✅ Lessons exported to '{zip_filename}'")
 
 def show_lesson_info(args):
     """Show detailed information about a lesson"""
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
-        
+    with _get_manager() as manager:
         lesson_id = args.name
         
         print(f"Lesson Information: {lesson_id}")
@@ -225,48 +230,48 @@ def show_lesson_info(args):
             print(f"❌ Lesson '{lesson_id}' not found")
             sys.exit(1)
         
-        print(f"Name: {metadata.name}")
-        print(f"Description: {metadata.description}")
-        print(f"Author: {metadata.author}")
-        print(f"Version: {metadata.version}")
-        print(f"Created: {metadata.created}")
-        print(f"Tags: {', '.join(metadata.tags)}")
-        print(f"Difficulty: {metadata.difficulty}")
-        print(f"Duration: {metadata.duration} minutes")
+        parts = [
+            f"Name: {metadata.name}",
+            f"Description: {metadata.description}",
+            f"Author: {metadata.author}",
+            f"Version: {metadata.version}",
+            f"Created: {metadata.created}",
+            f"Tags: {', '.join(metadata.tags)}",
+            f"Difficulty: {metadata.difficulty}",
+            f"Duration: {metadata.duration} minutes",
+        ]
         
         if metadata.requirements:
-            print(f"Requirements: {', '.join(metadata.requirements)}")
+            parts.append(f"Requirements: {', '.join(metadata.requirements)}")
         
         if metadata.dependencies:
-            print(f"Dependencies: {', '.join(metadata.dependencies)}")
+            parts.append(f"Dependencies: {', '.join(metadata.dependencies)}")
         
         # Get lesson content
         content = manager.get_lesson_content(lesson_id)
         if content:
-            lines = content.split('\n')
-            print(f"\nContent ({len(lines)} lines):")
-            print("-" * 30)
-            for i, line in enumerate(lines[:20], 1):
-                print(f"{i:3d}: {line}")
+            # Only split off the preview lines; count the rest without a list
+            line_count = content.count('\n') + 1
+            first_lines = content.split('\n', 20)[:20]
+            parts.append(f"\nContent ({line_count} lines):")
+            parts.append("-" * 30)
+            parts.extend(f"{i:3d}: {line}" for i, line in enumerate(first_lines, 1))
             
-            if len(lines) > 20:
-                print(f"... and {len(lines) - 20} more lines")
+            if line_count > 20:
+                parts.append(f"... and {line_count - 20} more lines")
         
         # Get lesson state if running
         state = manager.get_lesson_state(lesson_id)
         if state:
-            print(f"\nCurrent State:")
-            print("-" * 30)
-            for key, value in state.get('state', {}).items():
-                print(f"{key}: {value}")
+            parts.append(f"\nCurrent State:")
+            parts.append("-" * 30)
+            parts.extend(f"{key}: {value}" for key, value in state.get('state', {}).items())
+        
+        print('\n'.join(parts))
 
 def install_dependencies(args):
     """Install Python dependencies for lessons"""
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
-        
+    with _get_manager(require_app=True) as manager:
         print("Installing Python dependencies for lessons...")
         
         # Collect all requirements from lessons
@@ -280,32 +285,52 @@ def install_dependencies(args):
         
         print(f"Found requirements: {', '.join(all_requirements)}")
         
-        # Install dependencies
-        for requirement in all_requirements:
+        # Install all dependencies in a single pip run so they resolve together
+        pip_command = [sys.executable, '-m', 'pip', 'install',
+                       '--disable-pip-version-check', '--no-input']
+        try:
+            subprocess.check_call([*pip_command, *sorted(all_requirements)])
+            print("✅ All dependencies installed successfully")
+            return
+        except subprocess.CalledProcessError as e:
+            print(f"⚠️  Batch install failed ({e}), retrying one package at a time...")
+        
+        # Fall back to per-package installs to pinpoint the broken requirement
+        for requirement in sorted(all_requirements):
             print(f"Installing {requirement}...")
             try:
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', requirement])
+                subprocess.check_call([*pip_command, requirement])
                 print(f"✅ {requirement} installed successfully")
             except subprocess.CalledProcessError as e:
                 print(f"❌ Failed to install {requirement}: {e}")
                 sys.exit(1)
 
+def _count_definitions(content):
+    """Count function definitions and assignments in a single AST walk"""
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        # Fall back to a rough textual count for unparseable lessons
+        return content.count('def '), content.count(' = ')
+    
+    functions = 0
+    variables = 0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions += 1
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            variables += 1
+    
+    return functions, variables
+
 def analyze_lesson(args):
     """Analyze a lesson for Python tool usage and complexity"""
-    app = create_app()
-    
-    with app.app_context():
-        manager = LessonManager()
-        
+    with _get_manager() as manager:
         lesson_id = args.name
         
         print(f"Analyzing lesson '{lesson_id}'...")
         
-        # Get lesson content
-        content = manager.get_lesson_content(lesson_id)
-        if not content:
-            print(f"❌ Lesson '{lesson_id}' not found")
-            sys.exit(1)
+        content = _get_content_or_exit(manager, lesson_id)
         
         # Analyze imports
         imports = []
@@ -313,9 +338,8 @@ def analyze_lesson(args):
             if line.strip().startswith('import ') or line.strip().startswith('from '):
                 imports.append(line.strip())
         
-        print(f"\n📦 Imports ({len(imports)}):")
-        for imp in imports:
-            print(f"   {imp}")
+        parts = [f"\n📦 Imports ({len(imports)}):"]
+        parts.extend(f"   {imp}" for imp in imports)
         
         # Analyze hooks
         hooks = []
@@ -324,9 +348,8 @@ def analyze_lesson(args):
             if pattern in content:
                 hooks.append(pattern)
         
-        print(f"\n🎣 Hooks ({len(hooks)}):")
-        for hook in hooks:
-            print(f"   {hook}")
+        parts.append(f"\n🎣 Hooks ({len(hooks)}):")
+        parts.extend(f"   {hook}" for hook in hooks)
         
         # Analyze Python tools usage
         tools = {
@@ -352,19 +375,12 @@ def analyze_lesson(args):
             if f'import {tool}' in content or f'from {tool}' in content:
                 used_tools.append((tool, description))
         
-        print(f"\n🔧 Python Tools ({len(used_tools)}):")
-        for tool, description in used_tools:
-            print(f"   {tool}: {description}")
+        parts.append(f"\n🔧 Python Tools ({len(used_tools)}):")
+        parts.extend(f"   {tool}: {description}" for tool, description in used_tools)
         
         # Complexity analysis
         lines = len(content.split('\n'))
-        functions = content.count('def ')
-        variables = content.count(' = ')
-        
-        print(f"\n📊 Complexity Analysis:")
-        print(f"   Lines of code: {lines}")
-        print(f"   Functions: {functions}")
-        print(f"   Variable assignments: {variables}")
+        functions, variables = _count_definitions(content)
         
         if lines < 50:
             complexity = "Simple"
@@ -373,7 +389,15 @@ def analyze_lesson(args):
         else:
             complexity = "Complex"
         
-        print(f"   Overall complexity: {complexity}")
+        parts.extend([
+            f"\n📊 Complexity Analysis:",
+            f"   Lines of code: {lines}",
+            f"   Functions: {functions}",
+            f"   Variable assignments: {variables}",
+            f"   Overall complexity: {complexity}",
+        ])
+        
+        print('\n'.join(parts))
 
 def main():
     """Main CLI entry point"""
@@ -8,7 +8,8 @@ import time
 # Lesson configuration
 LESSON_NAME = "Counting Fingers"
 TARGET_GESTURES = ["fist", "open_hand", "point", "victory", "thumbs_up"]
-PROGRESS_PER_GESTURE = 20.0  # 20% per gesture
+_TARGET_SET = frozenset(TARGET_GESTURES)  # O(1) membership for handle_gesture
+PROGRESS_PER_GESTURE = 100.0 / len(TARGET_GESTURES)  # Equal share per gesture
 
 # Lesson state
 total_fingers = 0
@@ -29,11 +30,13 @@ def lesson_start():
     lesson_progress = 0.0
     
     # Update lesson state
-    state.set("lesson_name", LESSON_NAME)
-    state.set("target_gestures", TARGET_GESTURES)
-    state.set("total_fingers", total_fingers)
-    state.set("gestures_seen", list(gestures_seen))
-    state.set("lesson_progress", lesson_progress)
+    state.update({
+        "lesson_name": LESSON_NAME,
+        "target_gestures": TARGET_GESTURES,
+        "total_fingers": total_fingers,
+        "gestures_seen": list(gestures_seen),
+        "lesson_progress": lesson_progress
+    })
     
     emit("lesson_started", {
         "lesson_name": LESSON_NAME,
@@ -56,15 +59,26 @@ def handle_gesture(gesture_data):
     # Add to total fingers
     total_fingers += finger_count
     
+    # Per-gesture state, written in a single update below
+    updates = {
+        "total_fingers": total_fingers,
+        "current_gesture": gesture,
+        "current_finger_count": finger_count
+    }
+    
     # Track unique gestures
-    if gesture in TARGET_GESTURES and gesture not in gestures_seen:
+    if gesture in _TARGET_SET and gesture not in gestures_seen:
         gestures_seen.add(gesture)
-        lesson_progress = min(100.0, len(gestures_seen) * PROGRESS_PER_GESTURE)
+        lesson_progress = len(gestures_seen) * PROGRESS_PER_GESTURE
         
         log("INFO", f"New gesture! Progress: {lesson_progress:.1f}%")
         
+        # Seen gestures and progress only change on a new target gesture
+        updates["gestures_seen"] = list(gestures_seen)
+        updates["lesson_progress"] = lesson_progress
+        
         # Check if lesson is complete
-        if lesson_progress >= 100.0:
+        if len(gestures_seen) == len(TARGET_GESTURES):
             log("INFO", "Lesson completed!")
             emit("lesson_completed", {
                 "total_fingers": total_fingers,
@@ -72,12 +86,7 @@ def handle_gesture(gesture_data):
                 "final_progress": lesson_progress
             })
     
-    # Update state
-    state.set("total_fingers", total_fingers)
-    state.set("gestures_seen", list(gestures_seen))
-    state.set("lesson_progress", lesson_progress)
-    state.set("current_gesture", gesture)
-    state.set("current_finger_count", finger_count)
+    state.update(updates)
     
     # Emit gesture event
     emit("gesture_processed", {
@@ -90,15 +99,17 @@ def handle_gesture(gesture_data):
 @on_tick
 def lesson_tick():
     """Called periodically during the lesson"""
+    snapshot = state.snapshot()
+    
     # Update lesson duration
-    start_time = state.get("start_time")
+    start_time = snapshot.get("start_time")
     if start_time:
         duration = time.time() - start_time
         state.set("lesson_duration", duration)
     
     # Emit periodic update
     emit("lesson_tick", {
-        "total_fingers": state.get("total_fingers"),
-        "progress": state.get("lesson_progress"),
-        "gestures_seen": state.get("gestures_seen")
+        "total_fingers": snapshot.get("total_fingers"),
+        "progress": snapshot.get("lesson_progress"),
+        "gestures_seen": snapshot.get("gestures_seen")
     }) 
\ No newline at end of file
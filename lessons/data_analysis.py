@@ -1,156 +1,325 @@
 """
 data_analysis - Interactive Data Analysis Lesson
-Learn data science concepts through interactive gestures using basic Python
+Learn data science concepts through interactive gestures using Python and NumPy
 """
 
 import time
 import json
 import math
-import random
 from collections import defaultdict
 
+import numpy as np
+
 # Lesson configuration
 LESSON_NAME = "Interactive Data Analysis"
 TARGET_GESTURES = ["fist", "open_hand", "point", "victory", "thumbs_up", "ok"]
 ANALYSIS_TYPES = ["descriptive", "correlation", "distribution", "regression", "clustering", "summary"]
 
-# Generate simple dataset using basic Python
-random.seed(42)
+# Generate simple dataset with a seeded NumPy generator, one vectorized draw per column
+rng = np.random.default_rng(42)
 n_samples = 50
 
 # Create a simple dataset with relationships
-age = [random.randint(20, 65) for _ in range(n_samples)]
-income = [30000 + age[i] * 1000 + random.randint(-5000, 5000) for i in range(n_samples)]
-education = [random.randint(12, 20) for _ in range(n_samples)]
-experience = [age[i] - education[i] - 4 + random.randint(-2, 2) for i in range(n_samples)]
-satisfaction = [min(10, max(1, (income[i] / 10000) * 0.5 + experience[i] * 0.2 + random.randint(-2, 2))) for i in range(n_samples)]
+age = rng.integers(20, 66, n_samples)
+income = 30000 + age * 1000 + rng.integers(-5000, 5001, n_samples)
+education = rng.integers(12, 21, n_samples)
+experience = age - education - 4 + rng.integers(-2, 3, n_samples)
+satisfaction = np.clip((income / 10000) * 0.5 + experience * 0.2 + rng.integers(-2, 3, n_samples), 1, 10)
 
-# Create the main dataset as a list of dictionaries
-dataset = []
-for i in range(n_samples):
-    dataset.append({
-        'age': age[i],
-        'income': income[i],
-        'education': education[i],
-        'experience': experience[i],
-        'satisfaction': satisfaction[i]
-    })
+# Store the dataset column by column as NumPy arrays instead of one dict per row
+dataset = {
+    'age': age.astype(np.int64, copy=False),
+    'income': income.astype(np.int64, copy=False),
+    'education': education.astype(np.int64, copy=False),
+    'experience': experience.astype(np.int64, copy=False),
+    'satisfaction': satisfaction.astype(np.float64, copy=False)
+}
+
+# The dataset is fixed, so the columns and their ranges are shared by every analysis
+AGES = dataset['age']
+INCOMES = dataset['income']
+EDUCATIONS = dataset['education']
+EXPERIENCES = dataset['experience']
+SATISFACTIONS = dataset['satisfaction']
+AGE_MIN, AGE_MAX = int(AGES.min()), int(AGES.max())
+INCOME_MIN, INCOME_MAX = int(INCOMES.min()), int(INCOMES.max())
+SATISFACTION_MIN, SATISFACTION_MAX = float(SATISFACTIONS.min()), float(SATISFACTIONS.max())
 
 # Helper functions for statistical calculations
 def calculate_mean(data):
-    """Calculate mean of a list of numbers"""
-    return sum(data) / len(data) if data else 0
+    """Calculate mean of an array of numbers"""
+    return float(np.mean(data)) if len(data) else 0
 
 def calculate_median(data):
-    """Calculate median of a list of numbers"""
-    if not data:
+    """Calculate median of an array of numbers"""
+    if len(data) == 0:
         return 0
-    sorted_data = sorted(data)
-    n = len(sorted_data)
-    if n % 2 == 0:
-        return (sorted_data[n//2 - 1] + sorted_data[n//2]) / 2
-    else:
-        return sorted_data[n//2]
+    return float(np.median(data))
 
 def calculate_std(data):
-    """Calculate standard deviation of a list of numbers"""
-    if not data:
+    """Calculate standard deviation of an array of numbers"""
+    if len(data) == 0:
         return 0
-    mean = calculate_mean(data)
-    variance = sum((x - mean) ** 2 for x in data) / len(data)
-    return math.sqrt(variance)
+    return float(np.std(data))
 
 def calculate_correlation(x, y):
-    """Calculate correlation coefficient between two lists"""
+    """Calculate correlation coefficient between two arrays"""
     if len(x) != len(y) or len(x) == 0:
         return 0
     
-    mean_x = calculate_mean(x)
-    mean_y = calculate_mean(y)
-    
-    numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(len(x)))
-    denominator_x = sum((x[i] - mean_x) ** 2 for i in range(len(x)))
-    denominator_y = sum((y[i] - mean_y) ** 2 for i in range(len(y)))
+    dx = np.asarray(x, dtype=np.float64) - np.mean(x)
+    dy = np.asarray(y, dtype=np.float64) - np.mean(y)
     
-    if denominator_x == 0 or denominator_y == 0:
+    # Same zero-variance guard as before; np.corrcoef would return nan here
+    denominator = math.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+    if denominator == 0:
         return 0
     
-    return numerator / math.sqrt(denominator_x * denominator_y)
+    return float(np.dot(dx, dy)) / denominator
 
 def simple_linear_regression(x, y):
     """Simple linear regression"""
     if len(x) != len(y) or len(x) == 0:
         return 0, 0, 0, 0
     
-    mean_x = calculate_mean(x)
-    mean_y = calculate_mean(y)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    mean_x = float(x.mean())
+    mean_y = float(y.mean())
+    dx = x - mean_x
+    dy = y - mean_y
     
     # Calculate slope and intercept
-    numerator = sum((x[i] - mean_x) * (y[i] - mean_y) for i in range(len(x)))
-    denominator = sum((x[i] - mean_x) ** 2 for i in range(len(x)))
+    denominator = float(np.dot(dx, dx))
     
     if denominator == 0:
         return 0, mean_y, 0, 0
     
-    slope = numerator / denominator
+    covariance = float(np.dot(dx, dy))
+    slope = covariance / denominator
     intercept = mean_y - slope * mean_x
     
-    # Calculate R-squared
-    y_pred = [slope * x[i] + intercept for i in range(len(x))]
-    ss_res = sum((y[i] - y_pred[i]) ** 2 for i in range(len(y)))
-    ss_tot = sum((y[i] - mean_y) ** 2 for i in range(len(y)))
+    # Calculate R-squared; for a least-squares fit ss_res = ss_tot - slope * sum(dx * dy),
+    # so no predictions or residuals need to be materialized
+    ss_tot = float(np.dot(dy, dy))
+    ss_res = max(ss_tot - slope * covariance, 0.0)
     r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
     
     # Calculate RMSE
-    rmse = math.sqrt(sum((y[i] - y_pred[i]) ** 2 for i in range(len(y))) / len(y))
+    rmse = math.sqrt(ss_res / len(y))
     
     return slope, intercept, r_squared, rmse
 
+def _kmeanspp(values, k, rng):
+    """k-means++ seeding: each new centroid is drawn with probability proportional to D^2"""
+    centroids = np.empty(k)
+    centroids[0] = values[rng.integers(values.size)]
+    d2 = (values - centroids[0]) ** 2
+    
+    for c in range(1, k):
+        total = d2.sum()
+        # Every point already sits on a centroid, so any choice is as good
+        if total == 0.0:
+            centroids[c] = values[rng.integers(values.size)]
+        else:
+            centroids[c] = values[rng.choice(values.size, p=d2 / total)]
+        np.minimum(d2, (values - centroids[c]) ** 2, out=d2)
+    
+    return centroids
+
 def simple_clustering(data, k=3, max_iters=50):
     """Simple k-means clustering implementation"""
-    if not data or len(data) < k:
+    if len(data) < k:
         return [], []
     
-    # Initialize centroids randomly
-    centroids = random.sample(data, k)
+    values = np.asarray(data, dtype=np.float64)
     
+    # Spread the initial centroids out with k-means++ so Lloyd converges in fewer passes
+    centroids = _kmeanspp(values, k, rng)
+    
+    # Lloyd iterations as whole-array operations
     for _ in range(max_iters):
-        # Assign points to closest centroid
-        labels = []
-        for point in data:
-            distances = [abs(point - centroid) for centroid in centroids]
-            labels.append(distances.index(min(distances)))
-        
-        # Update centroids
-        new_centroids = []
-        for i in range(k):
-            cluster_points = [data[j] for j in range(len(data)) if labels[j] == i]
-            if cluster_points:
-                new_centroids.append(calculate_mean(cluster_points))
-            else:
-                new_centroids.append(centroids[i])
+        labels = np.argmin(np.abs(values[:, None] - centroids), axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.bincount(labels, weights=values, minlength=k)
+        new_centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
         
-        # Check convergence
-        if all(abs(new_centroids[i] - centroids[i]) < 0.01 for i in range(k)):
+        if np.all(np.abs(new_centroids - centroids) < 0.01):
             break
-            
+        
         centroids = new_centroids
     
     return labels, centroids
 
+# Every analysis depends only on the fixed dataset, so each is computed once at load
+def compute_descriptive():
+    """Descriptive statistics for age, income and satisfaction"""
+    # One (features, samples) block so each statistic is a single reduction over axis 1
+    features = ["age", "income", "satisfaction"]
+    block = np.vstack([AGES, INCOMES, SATISFACTIONS]).astype(np.float64)
+    stats = {
+        "mean": block.mean(axis=1).tolist(),
+        "median": np.median(block, axis=1).tolist(),
+        "std": block.std(axis=1).tolist()
+    }
+    ranges = [(AGE_MIN, AGE_MAX), (INCOME_MIN, INCOME_MAX), (SATISFACTION_MIN, SATISFACTION_MAX)]
+    
+    # Emit per-feature records, which is the shape the lesson player renders
+    results = {}
+    for i, feature in enumerate(features):
+        results[feature] = {
+            "mean": round(stats["mean"][i], 2),
+            "median": round(stats["median"][i], 2),
+            "std": round(stats["std"][i], 2),
+            "min": ranges[i][0],
+            "max": ranges[i][1]
+        }
+    return results
+
+def compute_correlation():
+    """Pairwise correlations between the features"""
+    correlations = {
+        "age_income": round(calculate_correlation(AGES, INCOMES), 3),
+        "age_satisfaction": round(calculate_correlation(AGES, SATISFACTIONS), 3),
+        "income_satisfaction": round(calculate_correlation(INCOMES, SATISFACTIONS), 3),
+        "education_income": round(calculate_correlation(EDUCATIONS, INCOMES), 3),
+        "experience_satisfaction": round(calculate_correlation(EXPERIENCES, SATISFACTIONS), 3)
+    }
+    return correlations
+
+def compute_distribution():
+    """Histograms and spread of age, income and satisfaction"""
+    # Equal-width histograms with 5 bins
+    age_hist, age_bins = np.histogram(AGES, bins=5)
+    income_hist, income_bins = np.histogram(INCOMES, bins=5)
+    satisfaction_hist, satisfaction_bins = np.histogram(SATISFACTIONS, bins=5)
+    
+    distributions = {
+        "age": {
+            "histogram": age_hist.tolist(),
+            "bins": np.round(age_bins, 1).tolist(),
+            "mean": round(calculate_mean(AGES), 2),
+            "std": round(calculate_std(AGES), 2)
+        },
+        "income": {
+            "histogram": income_hist.tolist(),
+            "bins": np.round(income_bins, 1).tolist(),
+            "mean": round(calculate_mean(INCOMES), 2),
+            "std": round(calculate_std(INCOMES), 2)
+        },
+        "satisfaction": {
+            "histogram": satisfaction_hist.tolist(),
+            "bins": np.round(satisfaction_bins, 1).tolist(),
+            "mean": round(calculate_mean(SATISFACTIONS), 2),
+            "std": round(calculate_std(SATISFACTIONS), 2)
+        }
+    }
+    return distributions
+
+def compute_regression():
+    """Linear regressions of income and satisfaction on age"""
+    # Age vs Income regression
+    age_income_slope, age_income_intercept, age_income_r2, age_income_rmse = simple_linear_regression(AGES, INCOMES)
+    
+    # Age vs Satisfaction regression
+    age_satisfaction_slope, age_satisfaction_intercept, age_satisfaction_r2, age_satisfaction_rmse = simple_linear_regression(AGES, SATISFACTIONS)
+    
+    regressions = {
+        "age_vs_income": {
+            "slope": round(age_income_slope, 3),
+            "intercept": round(age_income_intercept, 3),
+            "r_squared": round(age_income_r2, 3),
+            "rmse": round(age_income_rmse, 3)
+        },
+        "age_vs_satisfaction": {
+            "slope": round(age_satisfaction_slope, 3),
+            "intercept": round(age_satisfaction_intercept, 3),
+            "r_squared": round(age_satisfaction_r2, 3),
+            "rmse": round(age_satisfaction_rmse, 3)
+        }
+    }
+    return regressions
+
+def compute_clustering():
+    """K-means clustering on a combined age/income metric"""
+    # Simple clustering on age and income
+    age_income_data = AGES * 0.5 + INCOMES * 0.0001  # Combined metric
+    
+    labels, centroids = simple_clustering(age_income_data, k=3)
+    
+    # Analyze clusters
+    cluster_analysis = {}
+    for i in range(3):
+        in_cluster = labels == i
+        cluster_size = int(np.count_nonzero(in_cluster))
+        if cluster_size:
+            cluster_analysis[f"cluster_{i+1}"] = {
+                "size": cluster_size,
+                "avg_age": round(calculate_mean(AGES[in_cluster]), 2),
+                "avg_income": round(calculate_mean(INCOMES[in_cluster]), 2),
+                "avg_satisfaction": round(calculate_mean(SATISFACTIONS[in_cluster]), 2)
+            }
+    
+    clustering_results = {
+        "n_clusters": 3,
+        "cluster_analysis": cluster_analysis,
+        "centroids": [round(c, 2) for c in centroids]
+    }
+    return clustering_results
+
+def compute_summary(descriptive, correlations):
+    """Summary insights about the dataset, reusing the descriptive and correlation results"""
+    insights = {
+        "sample_size": n_samples,
+        "age_range": f"{AGE_MIN} - {AGE_MAX} years",
+        "income_range": f"${INCOME_MIN:,} - ${INCOME_MAX:,}",
+        "satisfaction_range": f"{SATISFACTION_MIN:.1f} - {SATISFACTION_MAX:.1f}",
+        "strongest_correlation": "age vs income" if abs(correlations["age_income"]) > 0.5 else "none found",
+        "average_satisfaction": descriptive["satisfaction"]["mean"],
+        "data_quality": "Good - no missing values",
+        "recommendations": [
+            "Consider age-based marketing strategies",
+            "Focus on income-satisfaction relationship",
+            "Explore education impact on career success"
+        ]
+    }
+    return insights
+
+PRECOMPUTED_RESULTS = {
+    "descriptive": compute_descriptive(),
+    "correlation": compute_correlation(),
+    "distribution": compute_distribution(),
+    "regression": compute_regression(),
+    "clustering": compute_clustering()
+}
+PRECOMPUTED_RESULTS["summary"] = compute_summary(
+    PRECOMPUTED_RESULTS["descriptive"], PRECOMPUTED_RESULTS["correlation"]
+)
+
+# Gesture -> (analysis, completion message)
+GESTURE_ANALYSES = {
+    "fist": ("descriptive", "Descriptive statistics calculated successfully!"),
+    "open_hand": ("correlation", "Correlation analysis completed!"),
+    "point": ("distribution", "Distribution analysis completed!"),
+    "victory": ("regression", "Regression analysis completed!"),
+    "thumbs_up": ("clustering", "Clustering analysis completed!"),
+    "ok": ("summary", "Data analysis summary completed! Lesson finished!")
+}
+
 # Lesson state
 analyses_performed = 0
 current_analysis = None
 analysis_results = {}
 lesson_progress = 0.0
+last_tick_key = None
 
 @on_start
 def lesson_start():
     """Called when the lesson starts"""
-    global analyses_performed, current_analysis, analysis_results, lesson_progress
+    global analyses_performed, current_analysis, analysis_results, lesson_progress, last_tick_key
     
     log("INFO", f"Starting data analysis lesson: {LESSON_NAME}")
-    log("INFO", f"Dataset shape: {len(dataset)} samples, 5 features")
+    log("INFO", f"Dataset shape: {n_samples} samples, 5 features")
     log("INFO", f"Available gestures: {TARGET_GESTURES}")
     
     # Reset state
@@ -158,19 +327,16 @@ def lesson_start():
     current_analysis = None
     analysis_results = {}
     lesson_progress = 0.0
+    last_tick_key = None
     
     # Calculate basic statistics
-    ages = [d['age'] for d in dataset]
-    incomes = [d['income'] for d in dataset]
-    satisfactions = [d['satisfaction'] for d in dataset]
-    
     basic_stats = {
-        "n_samples": len(dataset),
+        "n_samples": n_samples,
         "n_features": 5,
         "feature_names": ['age', 'income', 'education', 'experience', 'satisfaction'],
-        "age_mean": round(calculate_mean(ages), 2),
-        "income_mean": round(calculate_mean(incomes), 2),
-        "satisfaction_mean": round(calculate_mean(satisfactions), 2)
+        "age_mean": round(calculate_mean(AGES), 2),
+        "income_mean": round(calculate_mean(INCOMES), 2),
+        "satisfaction_mean": round(calculate_mean(SATISFACTIONS), 2)
     }
     
     # Update lesson state
@@ -209,309 +375,68 @@ def handle_gesture(gesture_data):
     gesture = gesture_data.get("gesture")
     confidence = gesture_data.get("confidence", 0)
     
-    if not gesture or confidence < 0.7:
+    # Drop weak and unmapped gestures before any logging or state work
+    if confidence < 0.7:
+        return
+    analysis = GESTURE_ANALYSES.get(gesture)
+    if analysis is None:
         return
     
     log("INFO", f"Processing gesture: {gesture} (confidence: {confidence:.2f})")
     
-    # Map gestures to analyses
-    if gesture == "fist":
-        current_analysis = "descriptive"
-        analyses_performed += 1
-        
-        # Perform descriptive statistics
-        ages = [d['age'] for d in dataset]
-        incomes = [d['income'] for d in dataset]
-        educations = [d['education'] for d in dataset]
-        experiences = [d['experience'] for d in dataset]
-        satisfactions = [d['satisfaction'] for d in dataset]
-        
-        results = {
-            "age": {
-                "mean": round(calculate_mean(ages), 2),
-                "median": round(calculate_median(ages), 2),
-                "std": round(calculate_std(ages), 2),
-                "min": min(ages),
-                "max": max(ages)
-            },
-            "income": {
-                "mean": round(calculate_mean(incomes), 2),
-                "median": round(calculate_median(incomes), 2),
-                "std": round(calculate_std(incomes), 2),
-                "min": min(incomes),
-                "max": max(incomes)
-            },
-            "satisfaction": {
-                "mean": round(calculate_mean(satisfactions), 2),
-                "median": round(calculate_median(satisfactions), 2),
-                "std": round(calculate_std(satisfactions), 2),
-                "min": min(satisfactions),
-                "max": max(satisfactions)
-            }
-        }
-        
-        analysis_results["descriptive"] = results
-        lesson_progress = min(100.0, analyses_performed * 16.67)
-        
-        state.update({
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results,
-            "lesson_progress": lesson_progress
-        })
-        
-        emit("analysis_complete", {
-            "type": "descriptive",
-            "results": results,
-            "message": "Descriptive statistics calculated successfully!"
-        })
-        
-    elif gesture == "open_hand":
-        current_analysis = "correlation"
-        analyses_performed += 1
-        
-        # Perform correlation analysis
-        ages = [d['age'] for d in dataset]
-        incomes = [d['income'] for d in dataset]
-        educations = [d['education'] for d in dataset]
-        experiences = [d['experience'] for d in dataset]
-        satisfactions = [d['satisfaction'] for d in dataset]
-        
-        correlations = {
-            "age_income": round(calculate_correlation(ages, incomes), 3),
-            "age_satisfaction": round(calculate_correlation(ages, satisfactions), 3),
-            "income_satisfaction": round(calculate_correlation(incomes, satisfactions), 3),
-            "education_income": round(calculate_correlation(educations, incomes), 3),
-            "experience_satisfaction": round(calculate_correlation(experiences, satisfactions), 3)
-        }
-        
-        analysis_results["correlation"] = correlations
-        lesson_progress = min(100.0, analyses_performed * 16.67)
-        
-        state.update({
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results,
-            "lesson_progress": lesson_progress
-        })
-        
-        emit("analysis_complete", {
-            "type": "correlation",
-            "results": correlations,
-            "message": "Correlation analysis completed!"
-        })
-        
-    elif gesture == "point":
-        current_analysis = "distribution"
-        analyses_performed += 1
-        
-        # Perform distribution analysis
-        ages = [d['age'] for d in dataset]
-        incomes = [d['income'] for d in dataset]
-        satisfactions = [d['satisfaction'] for d in dataset]
-        
-        # Create simple histograms
-        def create_histogram(data, bins=5):
-            min_val, max_val = min(data), max(data)
-            bin_size = (max_val - min_val) / bins
-            histogram = [0] * bins
-            
-            for value in data:
-                bin_index = min(int((value - min_val) / bin_size), bins - 1)
-                histogram[bin_index] += 1
-            
-            return histogram, [min_val + i * bin_size for i in range(bins + 1)]
-        
-        age_hist, age_bins = create_histogram(ages, 5)
-        income_hist, income_bins = create_histogram(incomes, 5)
-        satisfaction_hist, satisfaction_bins = create_histogram(satisfactions, 5)
-        
-        distributions = {
-            "age": {
-                "histogram": age_hist,
-                "bins": [round(b, 1) for b in age_bins],
-                "mean": round(calculate_mean(ages), 2),
-                "std": round(calculate_std(ages), 2)
-            },
-            "income": {
-                "histogram": income_hist,
-                "bins": [round(b, 1) for b in income_bins],
-                "mean": round(calculate_mean(incomes), 2),
-                "std": round(calculate_std(incomes), 2)
-            },
-            "satisfaction": {
-                "histogram": satisfaction_hist,
-                "bins": [round(b, 1) for b in satisfaction_bins],
-                "mean": round(calculate_mean(satisfactions), 2),
-                "std": round(calculate_std(satisfactions), 2)
-            }
-        }
-        
-        analysis_results["distribution"] = distributions
-        lesson_progress = min(100.0, analyses_performed * 16.67)
-        
-        state.update({
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results,
-            "lesson_progress": lesson_progress
-        })
-        
-        emit("analysis_complete", {
-            "type": "distribution",
-            "results": distributions,
-            "message": "Distribution analysis completed!"
-        })
-        
-    elif gesture == "victory":
-        current_analysis = "regression"
-        analyses_performed += 1
-        
-        # Perform regression analysis
-        ages = [d['age'] for d in dataset]
-        incomes = [d['income'] for d in dataset]
-        satisfactions = [d['satisfaction'] for d in dataset]
-        
-        # Age vs Income regression
-        age_income_slope, age_income_intercept, age_income_r2, age_income_rmse = simple_linear_regression(ages, incomes)
-        
-        # Age vs Satisfaction regression
-        age_satisfaction_slope, age_satisfaction_intercept, age_satisfaction_r2, age_satisfaction_rmse = simple_linear_regression(ages, satisfactions)
-        
-        regressions = {
-            "age_vs_income": {
-                "slope": round(age_income_slope, 3),
-                "intercept": round(age_income_intercept, 3),
-                "r_squared": round(age_income_r2, 3),
-                "rmse": round(age_income_rmse, 3)
-            },
-            "age_vs_satisfaction": {
-                "slope": round(age_satisfaction_slope, 3),
-                "intercept": round(age_satisfaction_intercept, 3),
-                "r_squared": round(age_satisfaction_r2, 3),
-                "rmse": round(age_satisfaction_rmse, 3)
-            }
-        }
-        
-        analysis_results["regression"] = regressions
-        lesson_progress = min(100.0, analyses_performed * 16.67)
-        
-        state.update({
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results,
-            "lesson_progress": lesson_progress
-        })
-        
-        emit("analysis_complete", {
-            "type": "regression",
-            "results": regressions,
-            "message": "Regression analysis completed!"
-        })
-        
-    elif gesture == "thumbs_up":
-        current_analysis = "clustering"
-        analyses_performed += 1
-        
-        # Perform clustering analysis
-        ages = [d['age'] for d in dataset]
-        incomes = [d['income'] for d in dataset]
-        
-        # Simple clustering on age and income
-        combined_data = [(ages[i], incomes[i]) for i in range(len(ages))]
-        age_income_data = [ages[i] * 0.5 + incomes[i] * 0.0001 for i in range(len(ages))]  # Combined metric
-        
-        labels, centroids = simple_clustering(age_income_data, k=3)
-        
-        # Analyze clusters
-        cluster_analysis = {}
-        for i in range(3):
-            cluster_indices = [j for j, label in enumerate(labels) if label == i]
-            if cluster_indices:
-                cluster_ages = [ages[j] for j in cluster_indices]
-                cluster_incomes = [incomes[j] for j in cluster_indices]
-                cluster_satisfactions = [satisfactions[j] for j in cluster_indices]
-                
-                cluster_analysis[f"cluster_{i+1}"] = {
-                    "size": len(cluster_indices),
-                    "avg_age": round(calculate_mean(cluster_ages), 2),
-                    "avg_income": round(calculate_mean(cluster_incomes), 2),
-                    "avg_satisfaction": round(calculate_mean(cluster_satisfactions), 2)
-                }
-        
-        clustering_results = {
-            "n_clusters": 3,
-            "cluster_analysis": cluster_analysis,
-            "centroids": [round(c, 2) for c in centroids]
-        }
-        
-        analysis_results["clustering"] = clustering_results
-        lesson_progress = min(100.0, analyses_performed * 16.67)
-        
-        state.update({
-            "current_analysis": current_analysis,
-            "analysis_results": analysis_results,
-            "lesson_progress": lesson_progress
-        })
-        
-        emit("analysis_complete", {
-            "type": "clustering",
-            "results": clustering_results,
-            "message": "Clustering analysis completed!"
-        })
-        
-    elif gesture == "ok":
-        current_analysis = "summary"
-        analyses_performed += 1
-        
-        # Generate summary and insights
-        ages = [d['age'] for d in dataset]
-        incomes = [d['income'] for d in dataset]
-        satisfactions = [d['satisfaction'] for d in dataset]
-        
-        # Key insights
-        insights = {
-            "sample_size": len(dataset),
-            "age_range": f"{min(ages)} - {max(ages)} years",
-            "income_range": f"${min(incomes):,} - ${max(incomes):,}",
-            "satisfaction_range": f"{min(satisfactions):.1f} - {max(satisfactions):.1f}",
-            "strongest_correlation": "age vs income" if abs(calculate_correlation(ages, incomes)) > 0.5 else "none found",
-            "average_satisfaction": round(calculate_mean(satisfactions), 2),
-            "data_quality": "Good - no missing values",
-            "recommendations": [
-                "Consider age-based marketing strategies",
-                "Focus on income-satisfaction relationship",
-                "Explore education impact on career success"
-            ]
-        }
-        
-        analysis_results["summary"] = insights
+    current_analysis, message = analysis
+    analyses_performed += 1
+    results = PRECOMPUTED_RESULTS[current_analysis]
+    analysis_results[current_analysis] = results
+    
+    if current_analysis == "summary":
         lesson_progress = 100.0  # Complete the lesson
-        
-        state.update({
+    else:
+        lesson_progress = min(100.0, analyses_performed * 16.67)
+    
+    state.update({
+        "current_analysis": current_analysis,
+        "analysis_results": analysis_results,
+        "lesson_progress": lesson_progress
+    })
+    
+    # One event per gesture; the summary also carries the completion fields
+    payload = {
+        "type": current_analysis,
+        "results": results,
+        "state": {
             "current_analysis": current_analysis,
-            "analysis_results": analysis_results,
             "lesson_progress": lesson_progress
-        })
-        
-        emit("analysis_complete", {
-            "type": "summary",
-            "results": insights,
-            "message": "Data analysis summary completed! Lesson finished!"
-        })
-        
-        # Mark lesson as complete
-        emit("lesson_completed", {
+        },
+        "message": message
+    }
+    
+    if current_analysis == "summary":
+        payload.update({
+            "completed": True,
             "final_progress": lesson_progress,
-            "total_analyses": analyses_performed,
-            "insights": insights
+            "total_analyses": analyses_performed
         })
+    
+    emit("analysis_complete", payload)
 
 @on_tick
 def lesson_tick():
     """Called periodically during the lesson"""
+    global last_tick_key
+    
     # Update progress based on analyses performed
     analyses = state.get("analyses_performed", 0)
     progress = min(100.0, analyses * 16.67)  # 6 analyses = 100%
     
     state.set("lesson_progress", progress)
     
+    # The tick carries nothing time-derived, so an unchanged key means an identical payload
+    tick_key = (analyses, progress)
+    if tick_key == last_tick_key:
+        return
+    last_tick_key = tick_key
+    
     emit("lesson_tick", {
         "progress": progress,
         "analyses_performed": analyses
@@ -526,7 +451,7 @@ def lesson_complete():
         "total_analyses": analyses_performed,
         "final_progress": lesson_progress,
         "analysis_types_completed": list(analysis_results.keys()),
-        "dataset_size": len(dataset),
+        "dataset_size": n_samples,
         "completion_time": time.time() - state.get("start_time", time.time())
     }
     
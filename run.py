@@ -4,22 +4,28 @@ Application Entry Point
 """
 
 import os
+from functools import cache
 from app import create_app, socketio
 
-print("Starting application...")
-app = create_app(os.environ.get('FLASK_ENV', 'development'))
-print("App created successfully")
+@cache
+def get_app():
+    """Create the application on first use, not at import"""
+    return create_app(os.environ.get('FLASK_ENV', 'development'))
 
 if __name__ == '__main__':
+    print("Starting application...")
+    app = get_app()
+    print("App created successfully")
+    
     port = int(os.environ.get('PORT', 8000))
     print("=" * 50)
     print(f"🚀 Server starting on: http://127.0.0.1:{port}")
     print("=" * 50)
     print("Starting server...")
-    # Run the application
+    # Development server only; production runs wsgi:application under gunicorn
     socketio.run(
         app,
         host='127.0.0.1',
         port=port,
-        debug=True 
-    ) 
\ No newline at end of file
+        debug=os.environ.get('FLASK_ENV', 'development') == 'development'
+    )
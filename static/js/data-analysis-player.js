@@ -644,6 +644,14 @@ class DataAnalysisPlayer {
         
         // Show success message
         this.showMessage(`${this.analysisConfigs[type].title} completed!`, 'success');
+        
+        if (data.state) {
+            this.handleGestureProcessed({ progress: data.state.lesson_progress });
+        }
+        
+        if (data.completed) {
+            this.handleLessonCompleted(data);
+        }
     }
     
     handleGestureProcessed(data) {
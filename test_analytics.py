@@ -3,211 +3,223 @@
 Test script for Chandra Analytics & Progress Tracking
 """
 
-import requests
 import json
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
+import pytest
+
+from testutils import BASE_URL, http_get, http_post, log, server_up
+
+# Under pytest, skip when the dev server is not running
+pytestmark = pytest.mark.usefixtures("dev_server")
+
 # Configuration
-BASE_URL = "http://localhost:5000"
 USER_ID = 1
 LESSON_ID = "counting_fingers"
 SESSION_ID = f"test_session_{int(time.time())}"
 
-def test_analytics_endpoints():
-    """Test the analytics endpoints."""
-    print("🧪 Testing Chandra Analytics & Progress Tracking")
-    print("=" * 50)
-    
-    # Test 1: Log an event
-    print("\n1. Testing event logging...")
-    event_data = {
+try:
+    import orjson
+    dump_json = orjson.dumps
+except ImportError:
+    def dump_json(obj):
+        return json.dumps(obj).encode()
+
+# Ask for compressed bodies on the larger reads; urllib3 only decodes Brotli when brotli is installed
+try:
+    import brotli  # noqa: F401
+    COMPRESSED_HEADERS = {"Accept-Encoding": "gzip, deflate, br"}
+except ImportError:
+    COMPRESSED_HEADERS = {"Accept-Encoding": "gzip, deflate"}
+
+# Request bodies are serialized once here and posted as raw bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+EVENT_BODY = dump_json({
+    "event_type": "gesture",
+    "session_id": SESSION_ID,
+    "user_id": USER_ID,
+    "lesson_id": LESSON_ID,
+    "data": {
+        "gesture_type": "open_hand",
+        "confidence": 0.95,
+        "finger_count": 5
+    }
+})
+PROGRESS_BODY = dump_json({
+    "user_id": USER_ID,
+    "lesson_id": LESSON_ID,
+    "completed": True,
+    "score": 85.5,
+    "attempts": 1,
+    "time_spent": 120
+})
+# A short gesture stream sent to the batch endpoint in one request, one event per line
+GESTURE_STREAM_BODY = b"\n".join(
+    dump_json({
         "event_type": "gesture",
         "session_id": SESSION_ID,
         "user_id": USER_ID,
         "lesson_id": LESSON_ID,
-        "data": {
-            "gesture_type": "open_hand",
-            "confidence": 0.95,
-            "finger_count": 5
-        }
-    }
+        "data": {"gesture_type": gesture, "finger_count": finger_count}
+    })
+    for gesture, finger_count in [("fist", 0), ("point", 1), ("victory", 2), ("open_hand", 5)]
+)
+
+def report_encoding(response):
+    """Show how a response body was compressed, warning when it was sent as-is"""
+    encoding = response.headers.get('Content-Encoding')
+    if encoding:
+        log(f"   Content-Encoding: {encoding}")
+    else:
+        log("⚠️  Response was not compressed; the server ignored Accept-Encoding")
+
+def test_analytics_endpoints():
+    """Test the analytics endpoints."""
+    log("🧪 Testing Chandra Analytics & Progress Tracking")
+    log("=" * 50)
+    
+    # The requests are independent except that the reads should see both writes,
+    # so send the writes together, then the four reads together
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        event_request = pool.submit(http_post, f"{BASE_URL}/analytics/events", data=EVENT_BODY, headers=JSON_HEADERS)
+        progress_request = pool.submit(http_post, f"{BASE_URL}/analytics/progress", data=PROGRESS_BODY, headers=JSON_HEADERS)
+        batch_request = pool.submit(http_post, f"{BASE_URL}/analytics/events/batch", data=GESTURE_STREAM_BODY, headers=NDJSON_HEADERS)
+        wait([event_request, progress_request, batch_request])
+        
+        user_progress_request = pool.submit(http_get, f"{BASE_URL}/analytics/progress/{USER_ID}")
+        dashboard_request = pool.submit(http_get, f"{BASE_URL}/analytics/dashboard/data", headers=COMPRESSED_HEADERS)
+        lesson_analytics_request = pool.submit(http_get, f"{BASE_URL}/analytics/lessons/{LESSON_ID}/analytics")
+        # Stream the chart so its size can be measured without holding the whole PNG
+        chart_request = pool.submit(http_get, f"{BASE_URL}/analytics/charts/dashboard/overview",
+                                    headers=COMPRESSED_HEADERS, stream=True)
     
-    try:
-        response = requests.post(f"{BASE_URL}/analytics/events", json=event_data)
-        if response.status_code == 200:
-            print("✅ Event logged successfully")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Failed to log event: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error logging event: {e}")
+    # Test 1: Log an event
+    log("\n1. Testing event logging...")
+    response = event_request.result()
+    assert response.status_code == 200, f"Failed to log event: {response.status_code} {response.text}"
+    log("✅ Event logged successfully")
+    log(f"   Response: {response.json()}")
     
     # Test 2: Update progress
-    print("\n2. Testing progress update...")
-    progress_data = {
-        "user_id": USER_ID,
-        "lesson_id": LESSON_ID,
-        "completed": True,
-        "score": 85.5,
-        "attempts": 1,
-        "time_spent": 120
-    }
-    
-    try:
-        response = requests.post(f"{BASE_URL}/analytics/progress", json=progress_data)
-        if response.status_code == 200:
-            print("✅ Progress updated successfully")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Failed to update progress: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error updating progress: {e}")
+    log("\n2. Testing progress update...")
+    response = progress_request.result()
+    assert response.status_code == 200, f"Failed to update progress: {response.status_code} {response.text}"
+    log("✅ Progress updated successfully")
+    log(f"   Response: {response.json()}")
     
     # Test 3: Get user progress
-    print("\n3. Testing user progress retrieval...")
-    try:
-        response = requests.get(f"{BASE_URL}/analytics/progress/{USER_ID}")
-        if response.status_code == 200:
-            print("✅ User progress retrieved successfully")
-            data = response.json()
-            if data.get('success'):
-                progress = data.get('data', {})
-                print(f"   Total lessons: {progress.get('total_lessons', 0)}")
-                print(f"   Completed lessons: {progress.get('completed_lessons', 0)}")
-                print(f"   Progress percentage: {progress.get('progress_percentage', 0)}%")
-            else:
-                print(f"   Error: {data.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Failed to get user progress: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error getting user progress: {e}")
+    log("\n3. Testing user progress retrieval...")
+    response = user_progress_request.result()
+    assert response.status_code == 200, f"Failed to get user progress: {response.status_code} {response.text}"
+    data = response.json()
+    assert data.get('success'), f"User progress error: {data.get('error', 'Unknown error')}"
+    progress = data.get('data', {})
+    log("✅ User progress retrieved successfully")
+    log(f"   Total lessons: {progress.get('total_lessons', 0)}")
+    log(f"   Completed lessons: {progress.get('completed_lessons', 0)}")
+    log(f"   Progress percentage: {progress.get('progress_percentage', 0)}%")
     
     # Test 4: Get dashboard data
-    print("\n4. Testing dashboard data...")
-    try:
-        response = requests.get(f"{BASE_URL}/analytics/dashboard/data")
-        if response.status_code == 200:
-            print("✅ Dashboard data retrieved successfully")
-            data = response.json()
-            if data.get('success'):
-                dashboard = data.get('data', {})
-                print(f"   Total users: {dashboard.get('total_users', 0)}")
-                print(f"   Total lessons: {dashboard.get('total_lessons', 0)}")
-                print(f"   Recent activity: {dashboard.get('recent_activity', 0)}")
-            else:
-                print(f"   Error: {data.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Failed to get dashboard data: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error getting dashboard data: {e}")
+    log("\n4. Testing dashboard data...")
+    response = dashboard_request.result()
+    assert response.status_code == 200, f"Failed to get dashboard data: {response.status_code} {response.text}"
+    data = response.json()
+    assert data.get('success'), f"Dashboard data error: {data.get('error', 'Unknown error')}"
+    dashboard = data.get('data', {})
+    log("✅ Dashboard data retrieved successfully")
+    report_encoding(response)
+    log(f"   Total users: {dashboard.get('total_users', 0)}")
+    log(f"   Total lessons: {dashboard.get('total_lessons', 0)}")
+    log(f"   Recent activity: {dashboard.get('recent_activity', 0)}")
     
     # Test 5: Get lesson analytics
-    print("\n5. Testing lesson analytics...")
-    try:
-        response = requests.get(f"{BASE_URL}/analytics/lessons/{LESSON_ID}/analytics")
-        if response.status_code == 200:
-            print("✅ Lesson analytics retrieved successfully")
-            data = response.json()
-            if data.get('success'):
-                analytics = data.get('data', {})
-                print(f"   Total plays: {analytics.get('total_plays', 0)}")
-                print(f"   Completed plays: {analytics.get('completed_plays', 0)}")
-                print(f"   Completion rate: {analytics.get('completion_rate', 0)}%")
-            else:
-                print(f"   Error: {data.get('error', 'Unknown error')}")
-        else:
-            print(f"❌ Failed to get lesson analytics: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error getting lesson analytics: {e}")
-    
-    # Test 6: Test chart generation (optional - requires matplotlib)
-    print("\n6. Testing chart generation...")
-    try:
-        response = requests.get(f"{BASE_URL}/analytics/charts/dashboard/overview")
-        if response.status_code == 200:
-            print("✅ Dashboard chart generated successfully")
-            print(f"   Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
-            print(f"   Content-Length: {len(response.content)} bytes")
-        else:
-            print(f"❌ Failed to generate dashboard chart: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error generating chart: {e}")
-    
-    print("\n" + "=" * 50)
-    print("🎉 Analytics testing completed!")
+    log("\n5. Testing lesson analytics...")
+    response = lesson_analytics_request.result()
+    assert response.status_code == 200, f"Failed to get lesson analytics: {response.status_code} {response.text}"
+    data = response.json()
+    assert data.get('success'), f"Lesson analytics error: {data.get('error', 'Unknown error')}"
+    analytics = data.get('data', {})
+    log("✅ Lesson analytics retrieved successfully")
+    log(f"   Total plays: {analytics.get('total_plays', 0)}")
+    log(f"   Completed plays: {analytics.get('completed_plays', 0)}")
+    log(f"   Completion rate: {analytics.get('completion_rate', 0)}%")
+    
+    # Test 6: Test chart generation (requires matplotlib on the server)
+    log("\n6. Testing chart generation...")
+    with chart_request.result() as response:
+        assert response.status_code == 200, f"Failed to generate dashboard chart: {response.status_code} {response.text}"
+        size = int(response.headers.get('Content-Length', 0)) or sum(
+            len(chunk) for chunk in response.iter_content(65536)
+        )
+        log("✅ Dashboard chart generated successfully")
+        log(f"   Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
+        log(f"   Content-Length: {size} bytes")
+        report_encoding(response)
+    
+    # Test 7: Log a batch of events
+    log("\n7. Testing batch event logging...")
+    response = batch_request.result()
+    assert response.status_code == 200, f"Failed to log event batch: {response.status_code} {response.text}"
+    log("✅ Event batch logged successfully")
+    log(f"   Response: {response.json()}")
+    
+    log("\n" + "=" * 50)
+    log("🎉 Analytics testing completed!")
 
 def test_script_integration():
     """Test script integration with analytics."""
-    print("\n🧪 Testing Script Integration with Analytics")
-    print("=" * 50)
-    
-    # Test script start with analytics
-    print("\n1. Testing script start with analytics...")
-    script_start_data = {
-        "script_id": LESSON_ID,
-        "session_id": SESSION_ID,
-        "user_id": USER_ID
-    }
-    
-    try:
-        response = requests.post(f"{BASE_URL}/scripts/{LESSON_ID}/start", json=script_start_data)
-        if response.status_code == 200:
-            print("✅ Script started successfully")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Failed to start script: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error starting script: {e}")
-    
-    # Test gesture event with analytics
-    print("\n2. Testing gesture event with analytics...")
-    gesture_data = {
-        "script_id": LESSON_ID,
-        "gesture_data": {
-            "gesture": "open_hand",
-            "confidence": 0.92,
-            "landmarks": []
-        },
-        "session_id": SESSION_ID,
-        "user_id": USER_ID
-    }
-    
-    try:
-        response = requests.post(f"{BASE_URL}/scripts/{LESSON_ID}/gesture", json=gesture_data)
-        if response.status_code == 200:
-            print("✅ Gesture event processed successfully")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Failed to process gesture event: {response.status_code}")
-            print(f"   Response: {response.text}")
-    except Exception as e:
-        print(f"❌ Error processing gesture event: {e}")
-    
-    print("\n" + "=" * 50)
-    print("🎉 Script integration testing completed!")
+    log("\n🧪 Testing Script Integration with Analytics")
+    log("=" * 50)
+    
+    # Test lesson start
+    log("\n1. Testing lesson start...")
+    response = http_post(f"{BASE_URL}/scripts/lessons/{LESSON_ID}/start")
+    assert response.status_code == 200, f"Failed to start lesson: {response.status_code} {response.text}"
+    log("✅ Lesson started successfully")
+    log(f"   Response: {response.json()}")
+    
+    # Test lesson state after start
+    log("\n2. Testing lesson state...")
+    response = http_get(f"{BASE_URL}/scripts/lessons/{LESSON_ID}/state")
+    assert response.status_code == 200, f"Failed to get lesson state: {response.status_code} {response.text}"
+    log("✅ Lesson state retrieved successfully")
+    log(f"   Response: {response.json()}")
+    
+    http_post(f"{BASE_URL}/scripts/lessons/{LESSON_ID}/stop")
+    
+    log("\n" + "=" * 50)
+    log("🎉 Script integration testing completed!")
 
 if __name__ == "__main__":
-    print("🚀 Starting Chandra Analytics Tests")
-    print(f"📅 Test started at: {datetime.now()}")
-    print(f"🌐 Base URL: {BASE_URL}")
-    print(f"👤 User ID: {USER_ID}")
-    print(f"📚 Lesson ID: {LESSON_ID}")
-    print(f"🆔 Session ID: {SESSION_ID}")
-    
+    if not server_up():
+        print("❌ Server not reachable at localhost:5000 — start the Flask app first")
+        sys.exit(2)
+    
+    log("🚀 Starting Chandra Analytics Tests")
+    log(f"📅 Test started at: {datetime.now()}")
+    log(f"🌐 Base URL: {BASE_URL}")
+    log(f"👤 User ID: {USER_ID}")
+    log(f"📚 Lesson ID: {LESSON_ID}")
+    log(f"🆔 Session ID: {SESSION_ID}")
+    
+    failed = False
     try:
         test_analytics_endpoints()
         test_script_integration()
+    except AssertionError as e:
+        print(f"❌ {e}")
+        failed = True
     except KeyboardInterrupt:
         print("\n⏹️  Tests interrupted by user")
     except Exception as e:
         print(f"\n💥 Unexpected error: {e}")
+        failed = True
+    
+    log(f"\n📅 Test completed at: {datetime.now()}") 
     
-    print(f"\n📅 Test completed at: {datetime.now()}") 
\ No newline at end of file
+    if failed:
+        sys.exit(1)
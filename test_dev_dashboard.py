@@ -3,66 +3,64 @@
 Test script for the Local Dev Dashboard feature
 """
 
-import requests
 import json
+import sys
 import time
 
+import pytest
+
+from testutils import http_get, log, server_up
+
+# Under pytest, skip when the dev server is not running
+pytestmark = pytest.mark.usefixtures("dev_server")
+
 def test_dev_dashboard():
     """Test the dev dashboard API endpoints"""
     base_url = "http://localhost:5000"
     
-    print("🧪 Testing Chandra Dev Dashboard...")
-    print("=" * 50)
+    log("🧪 Testing Chandra Dev Dashboard...")
+    log("=" * 50)
     
     # Test 1: Check if dev dashboard page loads
-    print("\n1. Testing dev dashboard page...")
-    try:
-        response = requests.get(f"{base_url}/dev-dashboard")
-        if response.status_code == 200:
-            print("✅ Dev dashboard page loads successfully")
-        else:
-            print(f"❌ Dev dashboard page failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Error accessing dev dashboard: {e}")
+    log("\n1. Testing dev dashboard page...")
+    response = http_get(f"{base_url}/dev-dashboard")
+    assert response.status_code == 200, f"Dev dashboard page failed: {response.status_code}"
+    log("✅ Dev dashboard page loads successfully")
     
     # Test 2: Check dev status API
-    print("\n2. Testing dev status API...")
-    try:
-        response = requests.get(f"{base_url}/api/dev/status")
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success'):
-                print("✅ Dev status API working")
-                print(f"   - CPU: {data['data']['system']['cpu_percent']:.1f}%")
-                print(f"   - Memory: {data['data']['system']['memory_percent']:.1f}%")
-                print(f"   - Connected clients: {data['data']['server']['connected_clients']}")
-                print(f"   - Recent errors: {data['data']['errors']['recent_count']}")
-            else:
-                print(f"❌ Dev status API error: {data.get('error')}")
-        else:
-            print(f"❌ Dev status API failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Error accessing dev status API: {e}")
+    log("\n2. Testing dev status API...")
+    response = http_get(f"{base_url}/api/dev/status")
+    assert response.status_code == 200, f"Dev status API failed: {response.status_code}"
+    data = response.json()
+    assert data.get('success'), f"Dev status API error: {data.get('error')}"
+    log("✅ Dev status API working")
+    log(f"   - CPU: {data['data']['system']['cpu_percent']:.1f}%")
+    log(f"   - Memory: {data['data']['system']['memory_percent']:.1f}%")
+    log(f"   - Connected clients: {data['data']['server']['connected_clients']}")
+    log(f"   - Recent errors: {data['data']['errors']['recent_count']}")
     
     # Test 3: Check main status API
-    print("\n3. Testing main status API...")
-    try:
-        response = requests.get(f"{base_url}/api/status")
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Main status API working: {data['name']}")
-        else:
-            print(f"❌ Main status API failed: {response.status_code}")
-    except Exception as e:
-        print(f"❌ Error accessing main status API: {e}")
+    log("\n3. Testing main status API...")
+    response = http_get(f"{base_url}/api/status")
+    assert response.status_code == 200, f"Main status API failed: {response.status_code}"
+    data = response.json()
+    log(f"✅ Main status API working: {data['name']}")
     
-    print("\n" + "=" * 50)
-    print("🎉 Dev Dashboard test completed!")
-    print("\nTo view the dashboard:")
-    print(f"   Open: {base_url}/dev-dashboard")
-    print("\nTo test WebSocket connections:")
-    print("   1. Open a lesson player page")
-    print("   2. Check the 'Connected Clients' count in the dashboard")
+    log("\n" + "=" * 50)
+    log("🎉 Dev Dashboard test completed!")
+    log("\nTo view the dashboard:")
+    log(f"   Open: {base_url}/dev-dashboard")
+    log("\nTo test WebSocket connections:")
+    log("   1. Open a lesson player page")
+    log("   2. Check the 'Connected Clients' count in the dashboard")
 
 if __name__ == "__main__":
-    test_dev_dashboard() 
\ No newline at end of file
+    if not server_up():
+        print("❌ Server not reachable at localhost:5000 — start the Flask app first")
+        sys.exit(2)
+    
+    try:
+        test_dev_dashboard()
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1) 
\ No newline at end of file
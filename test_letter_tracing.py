@@ -7,18 +7,47 @@ import sys
 import os
 import time
 import json
+from functools import cache
 
-# Add the app directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+from testutils import log
 
-from app.scripts.engine import ScriptSandbox
+# Pauses only help a human follow the output; pass --slow to keep them
+SLOW = "--slow" in sys.argv
+
+def pace(seconds):
+    """Sleep for seconds when running with --slow"""
+    if SLOW:
+        time.sleep(seconds)
+
+SCRIPT_PATH = os.path.join('scripts', 'letter_tracing.py')
+
+# One pass over the four gestures per round
+BASE_GESTURES = [
+    {"gesture": "point", "fingerCount": 1},
+    {"gesture": "open_hand", "fingerCount": 5},
+    {"gesture": "victory", "fingerCount": 2},
+    {"gesture": "thumbs_up", "fingerCount": 1},
+]
+ROUNDS = 7
+
+@cache
+def load_script_code():
+    """Read the letter tracing script once and reuse the text on later runs"""
+    with open(SCRIPT_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def get_sandbox_class():
+    """Import the engine on first use so collecting this module does not load the whole app"""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+    from app.scripts.engine import ScriptSandbox
+    return ScriptSandbox
 
 def test_letter_tracing():
     """Test the letter tracing script"""
+    ScriptSandbox = get_sandbox_class()
     
     # Load the script
-    with open('scripts/letter_tracing.py', 'r') as f:
-        script_code = f.read()
+    script_code = load_script_code()
     
     # Create sandbox
     sandbox = ScriptSandbox('letter_tracing', 'test_session')
@@ -28,98 +57,64 @@ def test_letter_tracing():
         print("❌ Failed to load script")
         return False
     
-    print("✅ Script loaded successfully")
+    log("✅ Script loaded successfully")
     
     # Execute the script
     if not sandbox.execute_script():
         print("❌ Failed to execute script")
         return False
     
-    print("✅ Script executed successfully")
+    log("✅ Script executed successfully")
     
     # Start the script
     if not sandbox.start():
         print("❌ Failed to start script")
         return False
     
-    print("✅ Script started successfully")
+    log("✅ Script started successfully")
     
     # Test gesture handling
-    test_gestures = [
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-        {"gesture": "point", "fingerCount": 1},
-        {"gesture": "open_hand", "fingerCount": 5},
-        {"gesture": "victory", "fingerCount": 2},
-        {"gesture": "thumbs_up", "fingerCount": 1},
-    ]
-    
-    print("\n🧪 Testing gesture processing...")
-    
-    for i, gesture in enumerate(test_gestures):
-        print(f"  Gesture {i+1}: {gesture['gesture']} ({gesture['fingerCount']} fingers)")
-        sandbox.handle_gesture(gesture)
+    log("\n🧪 Testing gesture processing...")
+    
+    for round_number in range(1, ROUNDS + 1):
+        for gesture in BASE_GESTURES:
+            sandbox.handle_gesture(gesture)
         
-        # Get current state
+        # Poll state once per round rather than after every gesture
         state = sandbox.get_state()
-        current_letter = state.get('current_letter', 'Unknown')
         progress = state.get('lesson_progress', 0.0)
-        
-        print(f"    Current letter: {current_letter}")
-        print(f"    Progress: {progress:.1f}%")
+        log(f"  Round {round_number}: letter {state.get('current_letter', 'Unknown')}, progress {progress:.1f}%")
         
         # Check if lesson is complete
         if progress >= 100.0:
-            print("🎉 Lesson completed!")
+            log("🎉 Lesson completed!")
             break
         
-        time.sleep(0.1)  # Small delay for readability
+        pace(0.1)  # Small delay for readability
     
     # Test tick functionality
-    print("\n⏰ Testing tick functionality...")
+    log("\n⏰ Testing tick functionality...")
     for i in range(5):
         sandbox.tick()
-        time.sleep(0.1)
+        pace(0.1)
     
     # Get final state
     final_state = sandbox.get_state()
-    print(f"\n📊 Final state:")
-    print(f"  Lesson name: {final_state.get('lesson_name', 'Unknown')}")
-    print(f"  Current letter: {final_state.get('current_letter', 'Unknown')}")
-    print(f"  Progress: {final_state.get('lesson_progress', 0.0):.1f}%")
-    print(f"  Gestures for current letter: {final_state.get('gestures_for_current_letter', [])}")
+    log(f"\n📊 Final state:")
+    log(f"  Lesson name: {final_state.get('lesson_name', 'Unknown')}")
+    log(f"  Current letter: {final_state.get('current_letter', 'Unknown')}")
+    log(f"  Progress: {final_state.get('lesson_progress', 0.0):.1f}%")
+    log(f"  Gestures for current letter: {final_state.get('gestures_for_current_letter', [])}")
     
     # Stop the script
     sandbox.stop()
-    print("✅ Script stopped successfully")
+    log("✅ Script stopped successfully")
     
     return True
 
 if __name__ == "__main__":
-    print("🧪 Testing Letter Tracing Script")
-    print("=" * 40)
+    log("🧪 Testing Letter Tracing Script")
+    log("=" * 40)
     
     success = test_letter_tracing()
     
@@ -3,20 +3,40 @@
 Test script for Chandra robustness and error handling features
 """
 
+import sys
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import pytest
+
+from testutils import http_get, http_post, log, server_up
+
+# Under pytest, skip when the dev server is not running
+pytestmark = pytest.mark.usefixtures("dev_server")
+
+# Pauses only help a human follow the output; pass --slow to keep them
+SLOW = "--slow" in sys.argv
+
+def pace(seconds):
+    """Sleep for seconds when running with --slow"""
+    if SLOW:
+        time.sleep(seconds)
+
+# One timestamp for the whole run keeps the reported payloads identical across repeats
+RUN_STARTED_AT = datetime.utcnow().isoformat()
+
 def test_error_reporting():
     """Test the error reporting endpoint"""
-    print("Testing error reporting endpoint...")
+    log("Testing error reporting endpoint...")
     
     error_data = {
         "message": "Test error from frontend",
         "stack": "Error: Test error\n    at test.js:1:1",
         "name": "TestError",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": RUN_STARTED_AT,
         "userAgent": "Mozilla/5.0 (Test Browser)",
         "url": "http://localhost:5000/test",
         "context": {
@@ -27,89 +47,74 @@ def test_error_reporting():
         "userId": None
     }
     
-    try:
-        response = requests.post(
-            "http://localhost:5000/api/errors",
-            json=error_data,
-            headers={"Content-Type": "application/json"}
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("success"):
-                print("✅ Error reporting endpoint working correctly")
-                return True
-            else:
-                print("❌ Error reporting failed:", result.get("error"))
-                return False
-        else:
-            print(f"❌ Error reporting endpoint returned status {response.status_code}")
-            return False
-            
-    except requests.exceptions.ConnectionError:
-        print("❌ Could not connect to server. Make sure the Flask app is running.")
-        return False
-    except Exception as e:
-        print(f"❌ Error testing error reporting: {e}")
-        return False
+    response = http_post(
+        "http://localhost:5000/api/errors",
+        json=error_data,
+        headers={"Content-Type": "application/json"}
+    )
+    
+    assert response.status_code == 200, f"Error reporting endpoint returned status {response.status_code}"
+    result = response.json()
+    assert result.get("success"), f"Error reporting failed: {result.get('error')}"
+    log("✅ Error reporting endpoint working correctly")
 
 def test_connection_status():
     """Test the connection status endpoint"""
-    print("Testing connection status...")
+    log("Testing connection status...")
     
-    try:
-        response = requests.get("http://localhost:5000/api/dev/status")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("success"):
-                print("✅ Connection status endpoint working correctly")
-                return True
-            else:
-                print("❌ Connection status failed:", result.get("error"))
-                return False
-        else:
-            print(f"❌ Connection status endpoint returned status {response.status_code}")
-            return False
-            
-    except requests.exceptions.ConnectionError:
-        print("❌ Could not connect to server. Make sure the Flask app is running.")
-        return False
-    except Exception as e:
-        print(f"❌ Error testing connection status: {e}")
-        return False
+    response = http_get("http://localhost:5000/api/dev/status")
+    
+    assert response.status_code == 200, f"Connection status endpoint returned status {response.status_code}"
+    result = response.json()
+    assert result.get("success"), f"Connection status failed: {result.get('error')}"
+    log("✅ Connection status endpoint working correctly")
+
+# Top-level flag as jsonify writes it, compact or indented; quotes inside strings are escaped
+SUCCESS_FLAGS = {
+    b'"success":true': True,
+    b'"success": true': True,
+    b'"success":false': False,
+    b'"success": false': False,
+}
+
+def read_success_flag(response, chunk_size=8192):
+    """Scan a streamed JSON body for its success flag without parsing the rest"""
+    tail = b""
+    for chunk in response.iter_content(chunk_size):
+        window = tail + chunk
+        for pattern, value in SUCCESS_FLAGS.items():
+            if pattern in window:
+                return value
+        tail = window[-16:]  # Keep enough to catch a flag split across chunks
+    return None
 
 def test_script_endpoints():
     """Test script-related endpoints"""
-    print("Testing script endpoints...")
+    log("Testing script endpoints...")
     
+    # Test getting the lesson list; only the success flag matters, so skip parsing the list
+    with http_get("http://localhost:5000/scripts/lessons", stream=True) as response:
+        assert response.status_code == 200, f"Script endpoints returned status {response.status_code}"
+        assert read_success_flag(response), "Script endpoints failed: response did not report success"
+    log("✅ Script endpoints working correctly")
+
+def run_test(test_func):
+    """Run one test, reporting a failure instead of raising it"""
     try:
-        # Test getting scripts list
-        response = requests.get("http://localhost:5000/scripts/")
-        
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("success"):
-                print("✅ Script endpoints working correctly")
-                return True
-            else:
-                print("❌ Script endpoints failed:", result.get("error"))
-                return False
-        else:
-            print(f"❌ Script endpoints returned status {response.status_code}")
-            return False
-            
+        test_func()
+        return True
+    except AssertionError as e:
+        print(f"❌ {e}")
     except requests.exceptions.ConnectionError:
         print("❌ Could not connect to server. Make sure the Flask app is running.")
-        return False
     except Exception as e:
-        print(f"❌ Error testing script endpoints: {e}")
-        return False
+        print(f"❌ Error running {test_func.__name__}: {e}")
+    return False
 
 def main():
     """Run all robustness tests"""
-    print("🧪 Testing Chandra Robustness Features")
-    print("=" * 50)
+    log("🧪 Testing Chandra Robustness Features")
+    log("=" * 50)
     
     tests = [
         ("Error Reporting", test_error_reporting),
@@ -117,16 +122,27 @@ def main():
         ("Script Endpoints", test_script_endpoints)
     ]
     
-    passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
-        print(f"\n🔍 {test_name}...")
-        if test_func():
-            passed += 1
-        time.sleep(1)  # Brief pause between tests
+    if SLOW:
+        # One at a time with pauses, so the output reads in order
+        results = []
+        for test_name, test_func in tests:
+            log(f"\n🔍 {test_name}...")
+            results.append(run_test(test_func))
+            pace(1)  # Brief pause between tests
+    else:
+        # The tests share no state, so overlap their round trips
+        log(f"\n🔍 Running {total} tests concurrently...")
+        with ThreadPoolExecutor(max_workers=total) as pool:
+            futures = [pool.submit(run_test, test_func) for _, test_func in tests]
+            results = [future.result() for future in futures]
+        for (test_name, _), result in zip(tests, results):
+            log(f"   {'✅' if result else '❌'} {test_name}")
+    
+    passed = sum(results)
     
-    print("\n" + "=" * 50)
+    log("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
     
     if passed == total:
@@ -137,4 +153,8 @@ def main():
         return False
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if not server_up():
+        print("❌ Server not reachable at localhost:5000 — start the Flask app first")
+        sys.exit(2)
+    
+    sys.exit(0 if main() else 1) 
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+Shared helpers for the test scripts
+"""
+
+import atexit
+import os
+import socket
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "http://localhost:5000"
+
+# Set CHANDRA_QUIET (or run under CI=true) to drop decorative progress output;
+# failures and the final result are always printed
+QUIET = bool(os.environ.get("CHANDRA_QUIET")) or os.environ.get("CI") == "true"
+
+def log(*args, **kwargs):
+    """print() unless running quietly"""
+    if not QUIET:
+        print(*args, **kwargs)
+
+def server_up(host="localhost", port=5000):
+    """Cheap TCP probe so a stopped dev server fails the run once, up front"""
+    try:
+        socket.create_connection((host, port), timeout=0.25).close()
+        return True
+    except OSError:
+        return False
+
+# requests.Session is not thread-safe, so each thread that talks to the dev
+# server gets its own keep-alive session; a thread sends one request at a time,
+# so one pooled connection per session is enough
+_local = threading.local()
+_sessions = []
+_sessions_lock = threading.Lock()
+
+def _session():
+    """The calling thread's session, created on first use"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1,
+                                             max_retries=Retry(total=2, backoff_factor=0.1)))
+        _local.session = session
+        with _sessions_lock:
+            _sessions.append(session)
+    return session
+
+def http_get(url, **kwargs):
+    """GET url through the calling thread's session"""
+    return _session().get(url, **kwargs)
+
+def http_post(url, **kwargs):
+    """POST to url through the calling thread's session"""
+    return _session().post(url, **kwargs)
+
+@atexit.register
+def _close_sessions():
+    with _sessions_lock:
+        for session in _sessions:
+            session.close()
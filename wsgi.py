@@ -0,0 +1,17 @@
+"""
+Chandra-Edu Interactive Education Engine
+WSGI Entry Point
+
+Serve with gunicorn's eventlet worker instead of the development server:
+
+    gunicorn --worker-class eventlet -w 1 --worker-connections 1000 wsgi:application
+
+Socket.IO sessions and loaded lessons live in process memory, so scale with
+worker connections; more workers need sticky sessions and a message queue.
+"""
+
+from app import create_app
+
+# Config follows FLASK_ENV like every other entry point, since `flask run`
+# also discovers this module
+application = create_app()